@@ -0,0 +1,44 @@
+"""Notify workers on raw_event insert
+
+Revision ID: 5b7e2f1c9a3d
+Revises: c758e4339c68
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2f1c9a3d"
+down_revision: Union[str, Sequence[str], None] = "c758e4339c68"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE FUNCTION notify_new_raw_event() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('new_raw_event', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER raw_event_inserted
+        AFTER INSERT ON raw_event
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_new_raw_event()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER raw_event_inserted ON raw_event")
+    op.execute("DROP FUNCTION notify_new_raw_event()")
@@ -57,7 +57,7 @@ async def get_context(
         )
 
     session_events = await fetch_session_events(connection=db, session_id=latest_session.session_id)
-    session_summary = await generate_events_summary(events=session_events)
+    session_summary = generate_events_summary(events=session_events)
     session_context = SessionContext(
         session_id=latest_session.session_id,
         user_id=latest_session.user_id,
@@ -33,7 +33,7 @@ class Settings(BaseSettings):
         },
         description="Default ",
     )
-    context_exclude_keys: set[str] = ("token", "distinct_id")
+    context_exclude_keys: frozenset[str] = frozenset({"token", "distinct_id"})
 
     @property
     def sqlalchemy_url(self) -> URL:
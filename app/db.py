@@ -17,9 +17,11 @@ def get_engine() -> AsyncEngine:
     return _engine
 
 
-async def init_db() -> None:
+async def init_db(pool_size: int | None = None) -> None:
+    """Create the engine. Callers holding many connections at once size its pool, SQLAlchemy's default otherwise."""
     global _engine
-    _engine = create_async_engine(SETTINGS.sqlalchemy_url, echo=False, future=True)
+    pool_options = {} if pool_size is None else {"pool_size": pool_size}
+    _engine = create_async_engine(SETTINGS.sqlalchemy_url, echo=False, future=True, **pool_options)
 
 
 @asynccontextmanager
@@ -1,3 +1,4 @@
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
@@ -44,19 +45,24 @@ class ActionType(str, Enum):
     unknown = "unknown"
 
 
-class ParsedElements(BaseModel):
+# Intermediate enrichment results below are built for every event from already parsed data, they don't need
+# pydantic validation so plain slotted dataclasses are used, which are several times cheaper to construct.
+@dataclass(frozen=True, slots=True)
+class ParsedElements:
     element_type: str | None = None
     element_text: str | None = None
-    attributes: dict[str, str] = {}
-    hierarchy: list[str] = []
+    attributes: dict[str, str] = field(default_factory=dict)
+    hierarchy: list[str] = field(default_factory=list)
 
 
-class EventClassification(BaseModel):
+@dataclass(frozen=True, slots=True)
+class EventClassification:
     event_type: EventType
     action_type: ActionType
 
 
-class PageInfo(BaseModel):
+@dataclass(frozen=True, slots=True)
+class PageInfo:
     page_path: str
     page_title: str
 
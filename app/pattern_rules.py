@@ -86,7 +86,6 @@ PATTERN_RULES: list[PatternRule] = [
         severity=Severity.medium,
         filter=EventFilter(semantic_contains="update cart quantity"),
         min_count=5,
-        time_window=timedelta(minutes=10),
     ),
     PatternRule(
         code="product_comparison_paralysis",
@@ -137,7 +136,6 @@ PATTERN_RULES: list[PatternRule] = [
         severity=Severity.low,
         filter=EventFilter(semantic_contains="$"),
         min_count=4,
-        time_window=timedelta(minutes=10),
     ),
     PatternRule(
         code="favorite_toggler",
@@ -152,7 +150,6 @@ PATTERN_RULES: list[PatternRule] = [
         severity=Severity.low,
         filter=EventFilter(semantic_contains="filter"),
         min_count=5,
-        time_window=timedelta(minutes=10),
     ),
     PatternRule(
         code="demo_watcher",
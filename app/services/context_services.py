@@ -1,4 +1,5 @@
-from typing import Any, Sequence
+from collections.abc import Set
+from typing import Any
 
 from app.config import SETTINGS
 from app.models import ActionType, EnrichedEvent, EventType, PostHogProperties
@@ -6,11 +7,11 @@ from app.services.event_parsing import ParsedElements
 from app.utils import hyphens_to_snake_case
 
 
-async def build_context(
+def build_context(
     event_name: str,
     properties: PostHogProperties,
     element_info: ParsedElements,
-    excluded_keys: Sequence[str] = SETTINGS.context_exclude_keys,
+    excluded_keys: Set[str] = SETTINGS.context_exclude_keys,
 ) -> dict[str, Any]:
     """
     Build context dict with additional metadata for LLM.
@@ -18,6 +19,9 @@ async def build_context(
     Extracts useful metadata from properties and element info while
     filtering out PostHog internal fields.
     """
+    if not properties and not element_info.attributes and not element_info.hierarchy:  # thin events, nothing to add
+        return {"posthog_event": event_name} if event_name else {}
+
     # Skip blacklisted PostHog properties
     context = {key: value for key, value in properties.items() if not key.startswith("$") and key not in excluded_keys}
 
@@ -27,7 +31,7 @@ async def build_context(
 
     # Add element hierarchy
     if element_info.hierarchy:
-        context["hierarchy"] = element_info.hierarchy
+        context["hierarchy"] = list(element_info.hierarchy)  # element_info is cached, don't leak its list
 
     # 4. Add original event name (debugging)
     if event_name:
@@ -36,42 +40,63 @@ async def build_context(
     return context
 
 
-async def generate_events_summary(events: list[EnrichedEvent]) -> str:
+# (singular, plural) templates of session summary sentences
+SUMMARY_TEMPLATES: dict[str, tuple[str, str]] = {
+    "pages": ("Viewed 1 page including {pages}", "Viewed {count} pages including {pages}"),
+    "clicks": ("Clicked 1 time", "Clicked {count} times"),
+    "rage_clicks": (
+        "Rage-clicked 1 time (frustration detected)",
+        "Rage-clicked {count} times (frustration detected)",
+    ),
+    "custom_events": ("Triggered 1 custom event", "Triggered {count} custom events"),
+}
+
+
+def _format_summary_part(name: str, count: int, **kwargs: str) -> str:
+    singular, plural = SUMMARY_TEMPLATES[name]
+    return (singular if count == 1 else plural).format(count=count, **kwargs)
+
+
+def generate_events_summary(events: list[EnrichedEvent]) -> str:
     """Generate human-readable session summary from session and events. Pure function, no DB queries."""
     if not events:
         return "No activity recorded"
 
-    # Analyze events
-    page_views = [e for e in events if e.event_type == EventType.pageview]
-    clicks = [e for e in events if e.event_type == EventType.click]
-    rage_clicks = [e for e in events if e.action_type == ActionType.rage_click]
-    custom_events = [e for e in events if e.event_type == EventType.custom]
-
-    # Extract unique pages (max settings.pages_in_summary_limit)
-    unique_pages = []
-    seen_pages = set()
-    for e in page_views:
-        if e.page_title and e.page_title not in seen_pages:
-            unique_pages.append(e.page_title)
-            seen_pages.add(e.page_title)
-        if len(unique_pages) >= SETTINGS.pages_in_summary_limit:
-            break
+    # Analyze events in a single pass
+    page_views_count = clicks_count = rage_clicks_count = custom_events_count = 0
+    # Holds at most settings.pages_in_summary_limit titles, scanning such a short list is cheaper than hashing
+    unique_pages: list[str] = []
+    for e in events:
+        if e.event_type == EventType.pageview:
+            page_views_count += 1
+            if (
+                e.page_title
+                and len(unique_pages) < SETTINGS.pages_in_summary_limit
+                and e.page_title not in unique_pages
+            ):
+                unique_pages.append(e.page_title)
+        elif e.event_type == EventType.click:
+            clicks_count += 1
+        elif e.event_type == EventType.custom:
+            custom_events_count += 1
+
+        if e.action_type == ActionType.rage_click:
+            rage_clicks_count += 1
 
     # Build summary parts
     parts = []
 
     if unique_pages:
-        pages_text = ", ".join(unique_pages)
-        parts.append(f"Viewed {len(page_views)} pages including {pages_text}")
+        parts.append(_format_summary_part("pages", page_views_count, pages=", ".join(unique_pages)))
 
-    if clicks:
-        parts.append(f"Clicked {len(clicks)} times")
+    if clicks_count:
+        parts.append(_format_summary_part("clicks", clicks_count))
 
-    if rage_clicks:
-        parts.append(f"Rage-clicked {len(rage_clicks)} times (frustration detected)")
+    if rage_clicks_count:
+        parts.append(_format_summary_part("rage_clicks", rage_clicks_count))
 
-    if custom_events:
-        parts.append(f"Triggered {len(custom_events)} custom events")
+    if custom_events_count:
+        parts.append(_format_summary_part("custom_events", custom_events_count))
 
     if not parts:
         parts = ["No significant activity"]
@@ -6,7 +6,7 @@ from app.services.semantic_builder_services import SemanticLabelBuilder
 _label_builder = SemanticLabelBuilder()
 
 
-async def enrich_event(event: RawEvent, session: Session) -> EnrichedEventCreate:
+def enrich_event(event: RawEvent, session: Session) -> EnrichedEventCreate:
     element_info = parse_elements_chain(chain=event.elements_chain)
     classification = classify_event(event_name=event.event_name, properties=event.properties)
     page_info = extract_page_info(properties=event.properties)
@@ -19,7 +19,7 @@ async def enrich_event(event: RawEvent, session: Session) -> EnrichedEventCreate
         properties=event.properties,
     )
 
-    context = await build_context(event_name=event.event_name, properties=event.properties, element_info=element_info)
+    context = build_context(event_name=event.event_name, properties=event.properties, element_info=element_info)
     sequence_number = session.event_count + 1
 
     return EnrichedEventCreate(
@@ -1,8 +1,48 @@
 import re
+import sys
+from functools import lru_cache
 
 from app.models import ActionType, EventClassification, EventType, PageInfo, ParsedElements, PostHogProperties
 
+HIERARCHY_DEPTH = 5
+ELEMENTS_CHAIN_CACHE_SIZE = 8192  # the same elements (e.g. "Add to cart" button) are sent over and over again
+CLASSIFICATION_CACHE_SIZE = 4096
+CUSTOM_ATTRIBUTE_PREFIX = "attr__data-ph-capture-attribute-"
 
+# Compiled once at import, `.match()` anchors them at the segment start
+ELEMENT_TYPE_PATTERN = re.compile(r"[a-z0-9]+", re.IGNORECASE)
+HIERARCHY_ELEMENT_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _find_quoted_value(segment: str, key: str) -> str | None:
+    """Return the value of the first `key="..."` occurrence in the segment."""
+    start = segment.find(key)
+    if start == -1:
+        return None
+    start += len(key)
+    end = segment.find('"', start)
+    return segment[start:end] if end != -1 else None
+
+
+def _find_custom_attributes(segment: str) -> dict[str, str]:
+    """Collect all `attr__data-ph-capture-attribute-<name>="<value>"` pairs in a single scan over the segment."""
+    attributes = {}
+    position = segment.find(CUSTOM_ATTRIBUTE_PREFIX)
+    while position != -1:
+        name_start = position + len(CUSTOM_ATTRIBUTE_PREFIX)
+        name_end = segment.find("=", name_start)
+        if name_end > name_start and segment.startswith('"', name_end + 1):
+            value_start = name_end + 2
+            value_end = segment.find('"', value_start)
+            if value_end != -1:
+                attributes[segment[name_start:name_end]] = segment[value_start:value_end]
+                position = segment.find(CUSTOM_ATTRIBUTE_PREFIX, value_end + 1)
+                continue
+        position = segment.find(CUSTOM_ATTRIBUTE_PREFIX, position + 1)
+    return attributes
+
+
+@lru_cache(maxsize=ELEMENTS_CHAIN_CACHE_SIZE)
 def parse_elements_chain(chain: str) -> ParsedElements:
     """
     Parse PostHog elements_chain string into structured element information.
@@ -12,41 +52,34 @@ def parse_elements_chain(chain: str) -> ParsedElements:
     2. Element text - from `text="..."` attribute or `attr__alt="..."` in case of images
     3. Custom attributes - all `attr__data-ph-capture-attribute-*` attributes
     4. Hierarchy - first 5 DOM levels from chain segments
+
+    Attributes are located with plain `str.find` scans instead of regex searches, it's the hot path of enrichment.
+    Results are cached and shared between calls, so they must not be mutated.
     """
     if not chain:
         return ParsedElements()
 
-    # Split into segments (button;nav;header)
-    segments = chain.split(";")
+    # Split into segments (button;nav;header), deeper levels than the hierarchy limit are never looked at
+    segments = chain.split(";", HIERARCHY_DEPTH)[:HIERARCHY_DEPTH]
     first_segment = segments[0].strip()
 
     # Extract element type (part before '.' or ':')
-    element_type_match = re.match(r"^([a-z0-9]+)", first_segment, re.IGNORECASE)
-    element_type = element_type_match.group(1).lower() if element_type_match else None
+    element_type_match = ELEMENT_TYPE_PATTERN.match(first_segment)
+    # Tag names are a tiny set of values, interning shares a single str object between all parsed chains
+    element_type = sys.intern(element_type_match.group().lower()) if element_type_match else None
 
-    # Extract text with regex (handles escaped quotes)
-    text_match = re.search(r'text="([^"]*)"', first_segment)
-    element_text = text_match.group(1) if text_match else None
-
-    # Extract alt (for images)
-    if not element_text:
-        alt_match = re.search(r'attr__alt="([^"]*)"', first_segment)
-        element_text = alt_match.group(1) if alt_match else None
+    # Extract text, fall back to alt for images
+    element_text = _find_quoted_value(first_segment, 'text="') or _find_quoted_value(first_segment, 'attr__alt="')
 
     # Extract custom attributes (data-ph-capture-attribute-*)
-    attributes = {}
-    attr_matches = re.finditer(r'attr__data-ph-capture-attribute-([^=]+)="([^"]*)"', first_segment)
-    for match in attr_matches:
-        attr_name = match.group(1)
-        attr_value = match.group(2)
-        attributes[attr_name] = attr_value
+    attributes = _find_custom_attributes(first_segment)
 
     # Build hierarchy (just element types)
     hierarchy = []
-    for segment in segments[:5]:  # Limit to 5 levels
-        elem_match = re.match(r"^([a-z0-9]+)", segment.strip())
+    for segment in segments:
+        elem_match = HIERARCHY_ELEMENT_PATTERN.match(segment.strip())
         if elem_match:
-            hierarchy.append(elem_match.group(1))
+            hierarchy.append(sys.intern(elem_match.group()))
 
     return ParsedElements(
         element_type=element_type,
@@ -56,17 +89,25 @@ def parse_elements_chain(chain: str) -> ParsedElements:
     )
 
 
-def _classify_autocapture(properties: PostHogProperties) -> EventClassification:
-    # Check properties.$event_type to determine specific action
-    autocapture_type = properties.get("$event_type", "click")  # click as default
-    match autocapture_type:
-        case "click":
-            return EventClassification(event_type=EventType.click, action_type=ActionType.click)
-        case "submit":
-            return EventClassification(event_type=EventType.click, action_type=ActionType.submit)
-        case "change":
-            return EventClassification(event_type=EventType.click, action_type=ActionType.change)
-    return EventClassification(event_type=EventType.click, action_type=ActionType.click)
+SYSTEM_EVENT_CLASSIFICATIONS: dict[str, EventClassification] = {
+    "$pageview": EventClassification(event_type=EventType.pageview, action_type=ActionType.view),
+    "$pageleave": EventClassification(event_type=EventType.navigation, action_type=ActionType.leave),
+    "$rageclick": EventClassification(event_type=EventType.click, action_type=ActionType.rage_click),
+}
+# Keyed by properties.$event_type of $autocapture events
+AUTOCAPTURE_CLASSIFICATIONS: dict[str, EventClassification] = {
+    "click": EventClassification(event_type=EventType.click, action_type=ActionType.click),
+    "submit": EventClassification(event_type=EventType.click, action_type=ActionType.submit),
+    "change": EventClassification(event_type=EventType.click, action_type=ActionType.change),
+}
+
+
+# Keywords checked in order, first matching group wins (e.g. "submit_click" is a click)
+CUSTOM_EVENT_ACTION_KEYWORDS: tuple[tuple[tuple[str, ...], ActionType], ...] = (
+    (("click", "select", "choose"), ActionType.click),
+    (("submit", "complete", "finish"), ActionType.submit),
+    (("start", "open", "view", "navigate"), ActionType.navigate),
+)
 
 
 def infer_action_from_custom_event(event_name: str) -> str:
@@ -78,17 +119,10 @@ def infer_action_from_custom_event(event_name: str) -> str:
     """
     event_lower = event_name.lower()
 
-    # Click patterns
-    if any(keyword in event_lower for keyword in ["click", "select", "choose"]):
-        return ActionType.click
-
-    # Submit patterns
-    if any(keyword in event_lower for keyword in ["submit", "complete", "finish"]):
-        return ActionType.submit
-
-    # Navigate patterns
-    if any(keyword in event_lower for keyword in ["start", "open", "view", "navigate"]):
-        return ActionType.navigate
+    for keywords, action_type in CUSTOM_EVENT_ACTION_KEYWORDS:
+        for keyword in keywords:
+            if keyword in event_lower:
+                return action_type
 
     # Default for custom events
     return ActionType.click
@@ -103,17 +137,26 @@ def classify_event(event_name: str, properties: PostHogProperties) -> EventClass
     2. $autocapture - check properties.$event_type for specific action
     3. Custom events (no $ prefix) - classify as "custom"
     4. Unknown - fallback to "unknown"
+
+    The result depends only on the event name (and $event_type of autocapture events), so it's cached on those.
     """
+    autocapture_type = None
+    if event_name == "$autocapture":
+        autocapture_type = properties.get("$event_type")
+        if not isinstance(autocapture_type, str):  # must be hashable, any other type falls back to click anyway
+            autocapture_type = None
+    return _classify_event(event_name, autocapture_type)
+
+
+@lru_cache(maxsize=CLASSIFICATION_CACHE_SIZE)
+def _classify_event(event_name: str, autocapture_type: str | None) -> EventClassification:
     # PostHog system events
-    match event_name:
-        case "$pageview":
-            return EventClassification(event_type=EventType.pageview, action_type=ActionType.view)
-        case "$pageleave":
-            return EventClassification(event_type=EventType.navigation, action_type=ActionType.leave)
-        case "$rageclick":
-            return EventClassification(event_type=EventType.click, action_type=ActionType.rage_click)
-        case "$autocapture":
-            return _classify_autocapture(properties)
+    if event_name == "$autocapture":
+        return AUTOCAPTURE_CLASSIFICATIONS.get(
+            autocapture_type, AUTOCAPTURE_CLASSIFICATIONS["click"]
+        )  # click as default
+    if classification := SYSTEM_EVENT_CLASSIFICATIONS.get(event_name):
+        return classification
 
     if not event_name.startswith("$"):  # Custom events (no $ prefix), try to infer action from event name
         action_type = infer_action_from_custom_event(event_name)
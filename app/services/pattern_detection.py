@@ -1,33 +1,61 @@
+from dataclasses import dataclass, field
 from datetime import timedelta
 
-from pydantic import BaseModel
-
 from app.models import ActionType, EnrichedEvent, EventType, Pattern, SessionContext, Severity
 
 
-class EventFilter(BaseModel):
+# Rules are static configuration built once at import, so they skip pydantic validation. Frozen dataclasses make
+# equal filters hash alike, letting rules share filter results within one detect call.
+@dataclass(frozen=True, slots=True)
+class EventFilter:
     event_type: EventType | None = None
     action_type: ActionType | None = None
     page_path_prefix: str | None = None
     page_path_equals: str | None = None
     semantic_contains: str | None = None
+    semantic_contains_lower: str | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        needle = self.semantic_contains.lower() if self.semantic_contains is not None else None
+        object.__setattr__(self, "semantic_contains_lower", needle)
 
     def apply(self, events: list[EnrichedEvent]) -> list[EnrichedEvent]:
-        result = events
-        if self.event_type is not None:
-            result = [e for e in result if e.event_type == self.event_type]
-        if self.action_type is not None:
-            result = [e for e in result if e.action_type == self.action_type]
-        if self.page_path_prefix is not None:
-            result = [e for e in result if (e.page_path or "").startswith(self.page_path_prefix)]
-        if self.page_path_equals is not None:
-            result = [e for e in result if e.page_path == self.page_path_equals]
-        if self.semantic_contains is not None:
-            result = [e for e in result if self.semantic_contains.lower() in e.semantic_label.lower()]
-        return result
-
-
-class SessionFilter(BaseModel):
+        if not events:
+            return []
+
+        # Single pass over the events: unset conditions short-circuit on a local None check
+        # instead of materialising an intermediate list per condition.
+        event_type = self.event_type
+        action_type = self.action_type
+        path_prefix = self.page_path_prefix
+        path_equals = self.page_path_equals
+        needle = self.semantic_contains_lower
+        return [
+            e
+            for e in events
+            if (event_type is None or e.event_type == event_type)
+            and (action_type is None or e.action_type == action_type)
+            and (path_prefix is None or (e.page_path or "").startswith(path_prefix))
+            and (path_equals is None or e.page_path == path_equals)
+            and (needle is None or needle in e.semantic_label.lower())
+        ]
+
+
+def _apply_filter(
+    event_filter: EventFilter,
+    events: list[EnrichedEvent],
+    filter_results: dict[EventFilter, list[EnrichedEvent]] | None,
+) -> list[EnrichedEvent]:
+    if filter_results is None:
+        return event_filter.apply(events)
+    result = filter_results.get(event_filter)
+    if result is None:
+        result = filter_results[event_filter] = event_filter.apply(events)
+    return result
+
+
+@dataclass(frozen=True, slots=True)
+class SessionFilter:
     """Filter based on session metadata"""
 
     min_duration_seconds: float | None = None
@@ -38,9 +66,10 @@ class SessionFilter(BaseModel):
     max_page_views: int | None = None
 
     def matches(self, session: SessionContext) -> bool:
-        if self.min_duration_seconds and (session.duration_seconds or 0) < self.min_duration_seconds:
+        duration_seconds = session.duration_seconds
+        if self.min_duration_seconds and (duration_seconds or 0) < self.min_duration_seconds:
             return False
-        if self.max_duration_seconds and (session.duration_seconds or float("inf")) > self.max_duration_seconds:
+        if self.max_duration_seconds and (duration_seconds or float("inf")) > self.max_duration_seconds:
             return False
         if self.min_events and session.event_count < self.min_events:
             return False
@@ -53,7 +82,21 @@ class SessionFilter(BaseModel):
         return True
 
 
-class PatternRule(BaseModel):
+def _match_session_filter(
+    session_filter: SessionFilter,
+    session: SessionContext,
+    session_results: dict[SessionFilter, bool] | None,
+) -> bool:
+    if session_results is None:
+        return session_filter.matches(session)
+    result = session_results.get(session_filter)
+    if result is None:
+        result = session_results[session_filter] = session_filter.matches(session)
+    return result
+
+
+@dataclass(frozen=True, slots=True)
+class PatternRule:
     code: str
     description: str
     severity: Severity
@@ -67,21 +110,33 @@ class PatternRule(BaseModel):
     # Session-based conditions
     session_filter: SessionFilter | None = None
 
-    def matches(self, events: list[EnrichedEvent], session: SessionContext) -> bool:
-        """Check if pattern matches given events and session context."""
+    def matches(
+        self,
+        events: list[EnrichedEvent],
+        session: SessionContext,
+        filter_results: dict[EventFilter, list[EnrichedEvent]] | None = None,
+        session_results: dict[SessionFilter, bool] | None = None,
+    ) -> bool:
+        """Check if pattern matches given events and session context.
+
+        ``filter_results`` and ``session_results`` memoize ``EventFilter.apply`` and
+        ``SessionFilter.matches`` over the same events and session, letting rules that share a filter
+        evaluate it once.
+        """
         # Check session filter first (cheaper)
-        if self.session_filter and not self.session_filter.matches(session):
+        if self.session_filter and not _match_session_filter(self.session_filter, session, session_results):
             return False
 
         # If no event filter, only session filter matters
         if self.filter is None:
             return True
 
-        # Sort events by sequence
-        events_sorted = sorted(events, key=lambda e: e.sequence_number or 0)
+        # Not enough events in the session to ever reach min count
+        if len(events) < self.min_count:
+            return False
 
         # Apply positive filter
-        positives = self.filter.apply(events_sorted)
+        positives = _apply_filter(self.filter, events, filter_results)
 
         # Check min count
         if len(positives) < self.min_count:
@@ -92,16 +147,19 @@ class PatternRule(BaseModel):
             return True
 
         # Check negative condition
-        negative_candidates = self.negative_filter.apply(events_sorted)
+        negative_candidates = _apply_filter(self.negative_filter, events, filter_results)
 
         if self.negative_time_window is None:
             # No negative events at all
             return len(negative_candidates) == 0
 
-        # Check if negative event happened within time window after last positive
-        last_pos_time = positives[-1].timestamp
+        # Check if negative event happened within time window after last positive.
+        # Only the last positive by sequence matters, so a linear max replaces sorting; scanning
+        # in reverse keeps the latest event on sequence ties, as the stable sort did.
+        last_pos_time = max(reversed(positives), key=lambda e: e.sequence_number or 0).timestamp
+        window_end = last_pos_time + self.negative_time_window
         for e in negative_candidates:
-            if last_pos_time <= e.timestamp <= last_pos_time + self.negative_time_window:
+            if last_pos_time <= e.timestamp <= window_end:
                 return False  # Found negative event in window
 
         return True
@@ -117,11 +175,15 @@ class PatternRule(BaseModel):
 class PatternEngine:
     def __init__(self, rules: list[PatternRule]) -> None:
         self._rules = rules
+        # Rules that can still match a session without events; the rest need at least min_count of them
+        self._eventless_rules = [rule for rule in rules if rule.filter is None or rule.min_count <= 0]
 
     def detect(self, events: list[EnrichedEvent], session: SessionContext) -> list[Pattern]:
         """Detect patterns in events given session context."""
         patterns: list[Pattern] = []
-        for rule in self._rules:
-            if rule.matches(events, session):
+        filter_results: dict[EventFilter, list[EnrichedEvent]] = {}
+        session_results: dict[SessionFilter, bool] = {}
+        for rule in self._rules if events else self._eventless_rules:
+            if rule.matches(events, session, filter_results, session_results):
                 patterns.append(rule.to_pattern())
         return patterns
@@ -1,5 +1,10 @@
+import json
+from contextlib import AsyncExitStack
+from enum import Enum
+from typing import Any, Sequence
 from uuid import UUID
 
+from sqlalchemy import JSON
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncConnection
 
@@ -8,6 +13,13 @@ from app.models import EnrichedEventCreate, PostHogEvent, RawEvent, RawEventStat
 from app.services.event_parsing import EventType
 from app.services.query_services import fetch_session
 
+# Above this many rows enriched events are streamed with COPY, below it a multi-row INSERT is cheaper to set up
+ENRICHED_EVENTS_COPY_THRESHOLD = 100
+# COPY bypasses SQLAlchemy's type processing, so values of these columns are serialized to JSON up front
+ENRICHED_EVENT_JSON_COLUMNS = frozenset(
+    column.name for column in enriched_event.columns if isinstance(column.type, JSON)
+)
+
 
 async def insert_raw_event(connection: AsyncConnection, event: PostHogEvent) -> None:
     stmt = raw_event.insert().values(
@@ -21,22 +33,59 @@ async def insert_raw_event(connection: AsyncConnection, event: PostHogEvent) ->
     await connection.execute(stmt)
 
 
-async def update_raw_event_status(connection: AsyncConnection, raw_event_id: UUID, status: RawEventStatus) -> None:
-    stmt = raw_event.update().values(status=status).where(raw_event.c.raw_event_id == raw_event_id)
+async def update_raw_events_status(
+    connection: AsyncConnection, raw_event_ids: Sequence[UUID], status: RawEventStatus
+) -> None:
+    """Update status of many raw events with a single UPDATE statement."""
+    stmt = raw_event.update().values(status=status).where(raw_event.c.raw_event_id.in_(raw_event_ids))
     await connection.execute(stmt)
 
 
-async def mark_event_as_failed(connection: AsyncConnection, event_id: UUID) -> None:
-    await update_raw_event_status(connection, raw_event_id=event_id, status=RawEventStatus.failed)
+async def mark_events_as_failed(connection: AsyncConnection, event_ids: Sequence[UUID]) -> None:
+    await update_raw_events_status(connection, raw_event_ids=event_ids, status=RawEventStatus.failed)
 
 
-async def mark_event_as_done(connection: AsyncConnection, event_id: UUID) -> None:
-    await update_raw_event_status(connection, raw_event_id=event_id, status=RawEventStatus.done)
+async def mark_events_as_done(connection: AsyncConnection, event_ids: Sequence[UUID]) -> None:
+    await update_raw_events_status(connection, raw_event_ids=event_ids, status=RawEventStatus.done)
 
 
-async def create_enriched_event(connection: AsyncConnection, input_data: EnrichedEventCreate) -> None:
-    stmt = enriched_event.insert().values(**input_data.model_dump())
-    await connection.execute(stmt)
+def _to_copy_record(input_data: EnrichedEventCreate) -> tuple[Any, ...]:
+    """Convert enriched event into a record in the raw form expected by asyncpg's COPY."""
+    record = []
+    for name, value in input_data.model_dump().items():
+        if isinstance(value, Enum):
+            value = value.value
+        elif name in ENRICHED_EVENT_JSON_COLUMNS and value is not None:
+            value = json.dumps(value)
+        record.append(value)
+    return tuple(record)
+
+
+async def create_enriched_events(connection: AsyncConnection, input_data: Sequence[EnrichedEventCreate]) -> None:
+    """
+    Bulk insert enriched events. Large batches are streamed with COPY, small ones use executemany.
+
+    COPY bypasses SQLAlchemy and runs on the asyncpg connection, while SQLAlchemy's asyncpg adapter sends BEGIN lazily
+    with the first statement it executes. If no statement has run in the caller's transaction yet, the COPY is wrapped
+    in a transaction of its own, so it is committed or rolled back as a whole.
+    """
+    if not input_data:
+        return
+
+    if len(input_data) <= ENRICHED_EVENTS_COPY_THRESHOLD:
+        await connection.execute(enriched_event.insert(), [item.model_dump() for item in input_data])
+        return
+
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    async with AsyncExitStack() as stack:
+        if not driver_connection.is_in_transaction():
+            await stack.enter_async_context(driver_connection.transaction())
+        await driver_connection.copy_records_to_table(
+            enriched_event.name,
+            records=[_to_copy_record(item) for item in input_data],
+            columns=list(EnrichedEventCreate.model_fields),
+        )
 
 
 async def get_or_create_session(connection: AsyncConnection, event: RawEvent) -> Session:
@@ -1,7 +1,21 @@
+from string import Formatter
+from typing import Any, Callable
+
 from app.config import SETTINGS
 from app.services.event_parsing import ActionType, EventType, PageInfo, ParsedElements
 from app.utils import capitalize_first_letter, humanize_snake_case_string, truncate_text
 
+LabelBuilder = Callable[[PageInfo, ParsedElements, str | None, dict[str, Any]], str]
+
+
+def _template_fields(template: str) -> frozenset[str]:
+    """Top-level property names a format template reads, e.g. "{product.name}" → {"product"}."""
+    return frozenset(
+        field_name.partition(".")[0].partition("[")[0]
+        for _, field_name, _, _ in Formatter().parse(template)
+        if field_name is not None
+    )
+
 
 class SemanticLabelBuilder:
     """
@@ -20,6 +34,19 @@ class SemanticLabelBuilder:
         self.custom_templates = custom_templates or SETTINGS.default_custom_event_templates
         self.max_length = max_length
 
+        # Properties each template needs are parsed once, so events missing one skip formatting entirely
+        self._compiled_templates: dict[str, tuple[str, frozenset[str]]] = {
+            event_name: (template, _template_fields(template)) for event_name, template in self.custom_templates.items()
+        }
+
+        # The match in _select_label_builder is resolved once per known type pair, so build() does a single
+        # dict lookup instead of walking the case patterns for every event
+        self._label_builders: dict[tuple[str, str], LabelBuilder] = {
+            (event_type, action_type): self._select_label_builder(event_type, action_type)
+            for event_type in EventType
+            for action_type in ActionType
+        }
+
     def build(
         self,
         event_type: str,
@@ -37,30 +64,36 @@ class SemanticLabelBuilder:
         properties = properties or {}
 
         # Dispatch to appropriate builder
+        label_builder = self._label_builders.get((event_type, action_type))
+        if label_builder is None:
+            label_builder = self._select_label_builder(event_type, action_type)
+        label = label_builder(page_info, element_info, event_name, properties)
+
+        # Post-processing
+        label = truncate_text(label, self.max_length)
+        label = capitalize_first_letter(label)
+
+        return label
+
+    def _select_label_builder(self, event_type: str, action_type: str) -> LabelBuilder:
         match (event_type, action_type):
             case (EventType.pageview, _):
-                label = self._build_pageview_label(page_info)
+                return lambda page, element, name, props: self._build_pageview_label(page)
 
             case (_, ActionType.rage_click):
-                label = self._build_rage_click_label(element_info, page_info)
+                return lambda page, element, name, props: self._build_rage_click_label(element, page)
 
             case (EventType.click, _):
-                label = self._build_click_label(element_info, page_info)
+                return lambda page, element, name, props: self._build_click_label(element, page)
 
             case (EventType.navigation, ActionType.leave):
-                label = self._build_navigation_label(page_info)
+                return lambda page, element, name, props: self._build_navigation_label(page)
 
             case (EventType.custom, _):
-                label = self._build_custom_label(event_name, properties)
+                return lambda page, element, name, props: self._build_custom_label(name, props)
 
             case _:
-                label = self._build_fallback_label(page_info)
-
-        # Post-processing
-        label = truncate_text(label, self.max_length)
-        label = capitalize_first_letter(label)
-
-        return label
+                return lambda page, element, name, props: self._build_fallback_label(page)
 
     def _build_pageview_label(self, page_info: PageInfo) -> str:
         return f"viewed {page_info.page_title}"
@@ -100,12 +133,14 @@ class SemanticLabelBuilder:
             return "custom event"
 
         # Try configured template
-        if event_name in self.custom_templates:
-            template = self.custom_templates[event_name]
-            try:
-                return template.format(**properties)
-            except KeyError:
-                pass  # Missing property, fall through to humanize
+        compiled = self._compiled_templates.get(event_name)
+        if compiled is not None:
+            template, fields = compiled
+            if fields.issubset(properties):
+                try:
+                    return template.format_map(properties)
+                except KeyError:
+                    pass  # Missing nested key, fall through to humanize
 
         return humanize_snake_case_string(event_name).lower()
 
@@ -126,9 +161,11 @@ class SemanticLabelBuilder:
         base_type = element_info.element_type or "element"
 
         # Apply enrichment rules in priority order
+        # One hash lookup per element attribute; rules are never scanned
+        enrichment_rules = self.enrichment_rules
         for attr_name in element_info.attributes:
-            if attr_name in self.enrichment_rules:
-                template = self.enrichment_rules[attr_name]
+            template = enrichment_rules.get(attr_name)
+            if template is not None:
                 return template.format(base_type=base_type)
 
         # No enrichment matched
@@ -1,26 +1,37 @@
 import asyncio
 import logging
 import signal
+from contextlib import AsyncExitStack
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 from app.db import get_connection, get_transaction, init_db
-from app.models import RawEvent
+from app.models import EnrichedEventCreate, RawEvent
 from app.services.enrichment_services import enrich_event
 from app.services.persist_services import (
-    create_enriched_event,
+    create_enriched_events,
     get_or_create_session,
-    mark_event_as_done,
-    mark_event_as_failed,
+    mark_events_as_done,
+    mark_events_as_failed,
     update_session_activity,
 )
 from app.services.query_services import fetch_events_for_processing
 
+try:
+    import uvloop
+except ImportError:  # uvloop is unavailable on Windows
+    uvloop = None
+
 BATCH_SIZE = 200
-WAIT_TIME = 1
+WAIT_TIME = 10  # fallback polling interval, workers are normally woken up by NOTIFY
+NEW_RAW_EVENT_CHANNEL = "new_raw_event"  # see notify_new_raw_event() trigger function
+WORKERS_COUNT = 10
+# Connections held at once: one per event worker, the LISTEN one and the main loop's fetch/flush transaction
+POOL_SIZE = WORKERS_COUNT + 2
 
-semaphore = asyncio.Semaphore(10)
 shutdown_event = asyncio.Event()
+raw_event_inserted = asyncio.Event()
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,8 +42,50 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def process_single_event(connection: AsyncConnection, event: RawEvent) -> None:
-    """Process a single raw event through the pipeline"""
+class ProcessedEventsBuffer:
+    """
+    Collects results of processed raw events, so they can be persisted in bulk: enriched events with a single
+    INSERT/COPY and FAILED statuses with a single UPDATE.
+
+    DONE status is written in each event's own transaction together with its session update, so an event is never
+    processed, and its session counted, twice. Only enriched events are deferred: a crash before the flush loses them,
+    but never makes an event count twice. Flushed once per batch, after all its events are processed, a whole
+    batch at once, so large batches go through COPY.
+    """
+
+    def __init__(self) -> None:
+        self.enriched_events: list[EnrichedEventCreate] = []
+        self.failed_ids: list[UUID] = []
+
+    async def flush(self) -> None:
+        """
+        Persist buffered results in a single transaction.
+
+        If that fails, all buffered events are marked as FAILED, so events already DONE without their enriched event
+        are told apart from the fully processed ones.
+        """
+        enriched_events, self.enriched_events = self.enriched_events, []
+        failed_ids, self.failed_ids = self.failed_ids, []
+        if not enriched_events and not failed_ids:
+            return
+
+        try:
+            async with get_transaction() as connection:
+                if failed_ids:
+                    await mark_events_as_failed(connection, failed_ids)
+                await create_enriched_events(connection, enriched_events)
+        except Exception:
+            unflushed_ids = [e.raw_event_id for e in enriched_events] + failed_ids
+            logger.exception(f"Failed to flush {len(unflushed_ids)} processed events, marking them as failed")
+            async with get_transaction() as connection:
+                await mark_events_as_failed(connection, unflushed_ids)
+
+
+async def process_single_event(connection: AsyncConnection, event: RawEvent) -> EnrichedEventCreate:
+    """
+    Process a single raw event through the pipeline, marking it as DONE in the same transaction as its session update.
+    Returned enriched event is persisted later, in bulk.
+    """
     async with connection.begin():
         # Extract session_id from PostHog properties
         session_id = event.session_id
@@ -43,32 +96,44 @@ async def process_single_event(connection: AsyncConnection, event: RawEvent) ->
         session = await get_or_create_session(connection=connection, event=event)
 
         # Enrich the event
-        enriched_event_data = await enrich_event(event=event, session=session)
-
-        # Save enriched event
-        await create_enriched_event(connection=connection, input_data=enriched_event_data)
+        enriched_event_data = enrich_event(event=event, session=session)
 
         # Update session activity
         await update_session_activity(
             connection=connection, session_id=session_id, event=event, enriched_event=enriched_event_data
         )
 
-        # Mark raw event as processed
-        await mark_event_as_done(connection=connection, event_id=event.raw_event_id)
+        await mark_events_as_done(connection, [event.raw_event_id])
 
+    return enriched_event_data
+
+
+async def process_event(connection: AsyncConnection, event_: RawEvent, events_buffer: ProcessedEventsBuffer) -> None:
+    try:
+        enriched_event_data = await process_single_event(connection, event_)
+    except Exception:
+        # process_single_event's transaction is already rolled back, the failure is recorded with the next flush
+        events_buffer.failed_ids.append(event_.raw_event_id)
+        logger.exception(f"Failed to process {event_.raw_event_id}")
+    else:
+        events_buffer.enriched_events.append(enriched_event_data)
 
-async def process_with_semaphore(event_: RawEvent) -> None:
-    async with semaphore:
-        async with get_connection() as connection:
-            try:
-                await process_single_event(connection, event_)
-            except Exception as e:
-                async with connection.begin():
-                    await mark_event_as_failed(connection, event_.raw_event_id)
-                logger.error(f"Failed to process {event_.raw_event_id}: {e}")
 
+async def event_worker(
+    connection: AsyncConnection, queue: asyncio.Queue[RawEvent], events_buffer: ProcessedEventsBuffer
+) -> None:
+    """Long-lived worker processing queued events on its own, dedicated connection."""
+    while True:
+        event = await queue.get()
+        try:
+            await process_event(connection, event, events_buffer)
+        except Exception as e:  # keep the worker alive, otherwise queue.join() would never return
+            logger.error(f"Worker failed to handle {event.raw_event_id}: {e}")
+        finally:
+            queue.task_done()
 
-async def process_batch() -> int:
+
+async def process_batch(queue: asyncio.Queue[RawEvent], events_buffer: ProcessedEventsBuffer) -> int:
     async with get_transaction() as conn:
         raw_events = await fetch_events_for_processing(conn, batch_size=BATCH_SIZE)
 
@@ -76,36 +141,120 @@ async def process_batch() -> int:
         return 0
 
     logger.info("Processing %s events...", len(raw_events))
-    async with asyncio.TaskGroup() as tg:
-        for event in raw_events:
-            tg.create_task(process_with_semaphore(event))
+    for event in raw_events:
+        queue.put_nowait(event)
+    await queue.join()
+
+    try:
+        await events_buffer.flush()
+    except Exception:  # keep the main loop running; failed events whose status couldn't be saved are retried
+        logger.exception(f"Failed to persist results of {len(raw_events)} processed events")
     return len(raw_events)
 
 
 def handle_shutdown(signum, frame):
     logger.info(f"Received signal {signum}, shutting down gracefully...")
     shutdown_event.set()
+    raw_event_inserted.set()  # wake up the main loop
+
+
+def on_raw_event_inserted(*args) -> None:
+    """asyncpg notification listener, called when new raw events are committed."""
+    raw_event_inserted.set()
+
+
+def on_listener_terminated(*args) -> None:
+    """asyncpg termination listener, called when the LISTEN connection is closed or lost."""
+    logger.warning("Raw event listener connection lost, resubscribing")
+    raw_event_inserted.set()  # wake up the main loop, so it resubscribes and catches up on missed notifications
+
+
+class RawEventListener:
+    """LISTEN subscription to new raw events, on its own connection which is replaced when lost."""
+
+    def __init__(self) -> None:
+        self._connection_stack: AsyncExitStack | None = None
+        self._driver_connection = None
+
+    @property
+    def is_subscribed(self) -> bool:
+        return self._driver_connection is not None and not self._driver_connection.is_closed()
+
+    async def subscribe(self) -> None:
+        await self.close()
+        stack = AsyncExitStack()
+        try:
+            connection = await stack.enter_async_context(get_connection())
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.add_listener(NEW_RAW_EVENT_CHANNEL, on_raw_event_inserted)
+            driver_connection.add_termination_listener(on_listener_terminated)
+        except BaseException:
+            await stack.aclose()
+            raise
+        self._connection_stack, self._driver_connection = stack, driver_connection
+
+    async def ensure_subscribed(self) -> None:
+        """Resubscribe if the listener connection was lost, falling back to polling while that's impossible."""
+        if self.is_subscribed:
+            return
+        try:
+            await self.subscribe()
+        except Exception:
+            logger.exception(f"Failed to resubscribe to new raw events, polling every {WAIT_TIME} seconds")
+
+    async def close(self) -> None:
+        driver_connection, self._driver_connection = self._driver_connection, None
+        connection_stack, self._connection_stack = self._connection_stack, None
+        if driver_connection is not None and not driver_connection.is_closed():
+            driver_connection.remove_termination_listener(on_listener_terminated)
+            await driver_connection.remove_listener(NEW_RAW_EVENT_CHANNEL, on_raw_event_inserted)
+        if connection_stack is not None:
+            try:
+                await connection_stack.aclose()
+            except Exception:  # connection is already broken, nothing more to release
+                logger.warning("Failed to close raw event listener connection", exc_info=True)
 
 
 async def main() -> None:
-    await init_db()
+    await init_db(pool_size=POOL_SIZE)
 
     # Register signal handlers
     signal.signal(signal.SIGTERM, handle_shutdown)
     signal.signal(signal.SIGINT, handle_shutdown)
 
-    while not shutdown_event.is_set():
-        processed = await process_batch()
+    queue: asyncio.Queue[RawEvent] = asyncio.Queue()
+    events_buffer = ProcessedEventsBuffer()
+    async with AsyncExitStack() as stack:
+        connections = [await stack.enter_async_context(get_connection()) for _ in range(WORKERS_COUNT)]
+        workers = [asyncio.create_task(event_worker(connection, queue, events_buffer)) for connection in connections]
 
-        if processed == 0:
-            logger.info("No jobs to process. Sleeping...")
-            try:
-                await asyncio.wait_for(shutdown_event.wait(), timeout=WAIT_TIME)
-            except asyncio.TimeoutError:
-                pass  # Continue loop
+        listener = RawEventListener()
+        await listener.subscribe()
+        stack.push_async_callback(listener.close)
+
+        while not shutdown_event.is_set():
+            await listener.ensure_subscribed()
+            # Cleared before fetching, so events inserted while the batch is processed aren't missed
+            raw_event_inserted.clear()
+            processed = await process_batch(queue, events_buffer)
+
+            if processed == 0:
+                logger.info("No jobs to process. Waiting for new events...")
+                try:
+                    await asyncio.wait_for(raw_event_inserted.wait(), timeout=WAIT_TIME)
+                except asyncio.TimeoutError:
+                    pass  # Continue loop
+
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
 
     logger.info("Worker shut down gracefully")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -1,6 +1,6 @@
 """
 Simple dummy client that reads events from sample_events.json and sends them
-sequentially to the ingestion endpoint as fast as possible.
+concurrently to the ingestion endpoint as fast as possible.
 """
 
 import asyncio
@@ -10,18 +10,26 @@ from pathlib import Path
 
 import httpx
 
+REPORT_INTERVAL = 1  # seconds between progress lines
+MAX_CONCURRENT = 100  # max in-flight requests
 
-async def send_event(client: httpx.AsyncClient, event: dict, url: str, index: int) -> bool:
+
+async def send_event(client: httpx.AsyncClient, event: dict, url: str, counters: dict[bool, int]) -> bool:
     """Send a single event to the ingestion endpoint."""
     try:
         response = await client.post(url, json={"event": event}, timeout=5.0)
         success = 200 <= response.status_code < 400
-        status = "✓" if success else "✗"
-        print(f"{status} Event {index + 1}: {response.status_code}")
-        return success
-    except Exception as e:
-        print(f"✗ Event {index + 1}: Error - {e}")
-        return False
+    except Exception:
+        success = False
+    counters[success] += 1
+    return success
+
+
+async def report_progress(counters: dict[bool, int], total: int) -> None:
+    """Print aggregated progress periodically instead of one line per request."""
+    while True:
+        await asyncio.sleep(REPORT_INTERVAL)
+        print(f"Progress: {counters[True] + counters[False]}/{total} sent ({counters[False]} failed)")
 
 
 async def main():
@@ -40,14 +48,26 @@ async def main():
     print(f"Sending to: {url}\n")
 
     start_time = time.time()
-    successful = 0
+    counters = {True: 0, False: 0}
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+    limits = httpx.Limits(max_connections=MAX_CONCURRENT, max_keepalive_connections=MAX_CONCURRENT)
+
+    async def send_with_semaphore(client_: httpx.AsyncClient, event: dict) -> bool:
+        async with semaphore:
+            return await send_event(client_, event, url, counters)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        reporter = asyncio.create_task(report_progress(counters, len(events)))
+        await asyncio.gather(*(send_with_semaphore(client, event) for event in events))
 
-    async with httpx.AsyncClient() as client:
-        for i, event in enumerate(events):
-            success = await send_event(client, event, url, i)
-            if success:
-                successful += 1
+        reporter.cancel()
+        try:
+            await reporter
+        except asyncio.CancelledError:
+            pass
 
+    successful = counters[True]
     duration = time.time() - start_time
     success_rate = (successful / len(events) * 100) if events else 0
 
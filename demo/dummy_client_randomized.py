@@ -12,6 +12,14 @@ from pathlib import Path
 
 import httpx
 
+try:
+    import uvloop
+except ImportError:  # uvloop is unavailable on Windows
+    uvloop = None
+
+TIMESTAMP_PLACEHOLDER = "__TIMESTAMP__"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class DummyClient:
     def __init__(
@@ -29,6 +37,9 @@ class DummyClient:
         self.use_traffic_waves = use_traffic_waves
 
         self.events = []
+        self._event_templates: list[tuple[bytes, bytes]] = []
+        self._timestamp_second: int | None = None
+        self._timestamp_bytes = b""
         self.stats = {
             "total_sent": 0,
             "success": 0,
@@ -52,22 +63,35 @@ class DummyClient:
         ]
 
     def load_events(self):
-        """Load sample events from JSON file."""
+        """Load sample events from JSON file and pre-serialize request bodies around the timestamp field."""
         with open(self.events_file, "r") as f:
             self.events = json.load(f)
+
+        self._event_templates = []
+        for event in self.events:
+            body = json.dumps({"event": {**event, "timestamp": TIMESTAMP_PLACEHOLDER}})
+            head, tail = body.split(TIMESTAMP_PLACEHOLDER, 1)
+            self._event_templates.append((head.encode(), tail.encode()))
         print(f"Loaded {len(self.events)} sample events")
 
-    def get_random_event(self):
-        """Get a random event and update its timestamp to now."""
-        event = random.choice(self.events).copy()
+    def _current_timestamp(self) -> bytes:
+        """Current timestamp, formatted at most once per second."""
+        now = time.time()
+        if int(now) != self._timestamp_second:
+            self._timestamp_second = int(now)
+            self._timestamp_bytes = datetime.fromtimestamp(now).isoformat().encode()
+        return self._timestamp_bytes
+
+    def get_random_event(self) -> bytes:
+        """Get a random pre-serialized event body with its timestamp set to now."""
+        head, tail = random.choice(self._event_templates)
         # Update timestamp to current time for more realistic data
-        event["timestamp"] = datetime.now().isoformat()
-        return event
+        return head + self._current_timestamp() + tail
 
-    async def send_event(self, client: httpx.AsyncClient, event: dict):
-        """Send a single event to the API."""
+    async def send_event(self, client: httpx.AsyncClient, event: bytes):
+        """Send a single pre-serialized event body to the API."""
         try:
-            response = await client.post(self.url, json={"event": event}, timeout=10.0)
+            response = await client.post(self.url, content=event, headers=JSON_HEADERS, timeout=10.0)
             if response.status_code == 202:
                 self.stats["success"] += 1
             else:
@@ -98,9 +122,11 @@ class DummyClient:
 
     async def producer(self, queue: asyncio.Queue):
         """Producer coroutine that generates events with dynamic traffic waves."""
-        end_time = time.time() + self.duration_seconds
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        end_time = now + self.duration_seconds
         wave_index = 0
-        wave_start = time.time()
+        wave_start = now
 
         if self.use_traffic_waves:
             min_rps, max_rps, wave_duration = self.traffic_waves[wave_index]
@@ -113,28 +139,29 @@ class DummyClient:
         self.stats["current_rps"] = current_rps
         self.stats["current_wave"] = wave_index
 
-        while time.time() < end_time:
+        # Events are scheduled at absolute times, so time spent in queue.put() doesn't skew the rate
+        next_send = now
+        while now < end_time:
             # Check if we need to switch to next wave
-            if self.use_traffic_waves and (time.time() - wave_start) >= wave_duration:
+            if self.use_traffic_waves and (now - wave_start) >= wave_duration:
                 wave_index = (wave_index + 1) % len(self.traffic_waves)
-                wave_start = time.time()
+                wave_start = now
                 min_rps, max_rps, wave_duration = self.traffic_waves[wave_index]
                 current_rps = random.uniform(min_rps, max_rps)
                 self.stats["current_rps"] = current_rps
                 self.stats["current_wave"] = wave_index
                 print(f"\n→ Switching to wave {wave_index + 1}: {current_rps:.1f} req/s for ~{wave_duration:.1f}s")
 
-            start = time.time()
-            interval = 1.0 / current_rps
-
             # Add event to queue
-            event = self.get_random_event()
-            await queue.put(event)
+            await queue.put(self.get_random_event())
 
-            # Sleep to maintain the current rate
-            elapsed = time.time() - start
-            sleep_time = max(0, interval - elapsed)
-            await asyncio.sleep(sleep_time)
+            # Sleep until the next scheduled send, skip sleeping entirely when behind schedule
+            next_send += 1.0 / current_rps
+            now = loop.time()
+            delay = next_send - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+                now = loop.time()
 
         print("\nProducer finished. Waiting for workers to complete...")
 
@@ -233,6 +260,9 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\nLoad test interrupted by user")
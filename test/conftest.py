@@ -11,7 +11,9 @@ from starlette.testclient import TestClient
 
 from app.api.dependencies import get_transaction_dependency
 from app.api.routes import router
-from app.models import EnrichedEventCreate
+from app.models import EnrichedEventCreate, RawEvent, RawEventStatus, Session
+
+FIXED_TIMESTAMP = datetime(2020, 1, 1)  # sample data is deterministic, no clock reads
 
 
 @pytest.fixture
@@ -25,14 +27,63 @@ def mock_connection() -> AsyncMock:
     return conn
 
 
+@pytest.fixture(scope="session")
+def _raw_event_template() -> RawEvent:
+    """Sample pending raw pageview event, validated once per test session"""
+    return RawEvent(
+        raw_event_id=uuid4(),
+        event_name="$pageview",
+        user_id="user-123",
+        timestamp=FIXED_TIMESTAMP,
+        properties={
+            "$session_id": "session-456",
+            "$pathname": "/home",
+            "title": "Home Page",
+        },
+        status=RawEventStatus.pending,
+        elements_chain=None,
+    )
+
+
 @pytest.fixture
-def sample_enriched_event() -> EnrichedEventCreate:
-    """Sample enriched event input"""
+def sample_raw_event(_raw_event_template: RawEvent) -> RawEvent:
+    """Sample pending raw pageview event, a fresh copy that is safe to modify"""
+    return _raw_event_template.model_copy(deep=True)
+
+
+@pytest.fixture(scope="session")
+def _session_template() -> Session:
+    """Sample active session the raw event belongs to, validated once per test session"""
+    return Session(
+        session_id="session-456",
+        user_id="user-123",
+        started_at=FIXED_TIMESTAMP,
+        last_activity_at=FIXED_TIMESTAMP,
+        event_count=5,
+        page_views_count=2,
+        clicks_count=3,
+        first_page="/home",
+        last_page="/about",
+        is_active=True,
+        created_at=FIXED_TIMESTAMP,
+        updated_at=FIXED_TIMESTAMP,
+    )
+
+
+@pytest.fixture
+def sample_session(_session_template: Session) -> Session:
+    """Sample active session the raw event belongs to, a fresh copy that is safe to modify"""
+    return _session_template.model_copy(deep=True)
+
+
+@pytest.fixture(scope="session")
+def _enriched_event_template() -> EnrichedEventCreate:
+    """Sample enriched event input, validated once per test session"""
     return EnrichedEventCreate(
         raw_event_id=uuid4(),
         user_id="user-123",
         session_id="session-456",
-        timestamp=datetime.utcnow(),
+        timestamp=FIXED_TIMESTAMP,
         event_name="$pageview",
         event_type="pageview",
         action_type="view",
@@ -46,23 +97,35 @@ def sample_enriched_event() -> EnrichedEventCreate:
     )
 
 
+@pytest.fixture
+def sample_enriched_event(_enriched_event_template: EnrichedEventCreate) -> EnrichedEventCreate:
+    """Sample enriched event input, a fresh copy that is safe to modify"""
+    return _enriched_event_template.model_copy(deep=True)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup(session_mocker: MockerFixture) -> None:
     session_mocker.patch("app.db.init_db", side_effect=AsyncMock())  # Make sure not to use real db, even by mistake
     session_mocker.patch("app.db.get_engine", side_effect=AsyncMock())
 
 
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """FastAPI app with API routes, built once per test session"""
+    app_ = FastAPI()
+    app_.include_router(router)
+    return app_
+
+
 @pytest.fixture
-def client() -> TestClient:
+def client(app: FastAPI) -> TestClient:
     """FastAPI test client"""
 
     async def override_get_transaction():
         mock_conn = AsyncMock()
         yield mock_conn
 
-    app = FastAPI()
-    app.include_router(router)
-
+    app.dependency_overrides.clear()
     app.dependency_overrides[get_transaction_dependency] = override_get_transaction
 
     # Create test client (synchronous!)
@@ -9,3 +9,13 @@ class AsyncContextManagerMock:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         return None
+
+
+class CountingAsyncStub:
+    """Lightweight replacement of AsyncMock for awaited calls whose arguments and result don't matter"""
+
+    def __init__(self):
+        self.await_count = 0
+
+    async def __call__(self, *args, **kwargs):
+        self.await_count += 1
@@ -17,6 +17,8 @@ from app.models import (
     Severity,
 )
 
+FIXED_TIMESTAMP = datetime(2020, 1, 1).isoformat()
+
 SAMPLE_POSTHOG_EVENT = {
     "event": "$pageview",
     "distinct_id": "user-123",
@@ -25,7 +27,7 @@ SAMPLE_POSTHOG_EVENT = {
         "$pathname": "/home",
         "title": "Home Page",
     },
-    "timestamp": datetime.utcnow().isoformat(),
+    "timestamp": FIXED_TIMESTAMP,
     "elements_chain": None,
 }
 
@@ -77,7 +79,6 @@ SAMPLE_SESSION = Session(
 )
 
 
-@pytest.mark.asyncio
 async def test_ingest_success(mocker: MockerFixture, client: TestClient) -> None:
     mock_insert = mocker.patch("app.api.routes.insert_raw_event", new_callable=AsyncMock)
     response = client.post("/ingest", json={"event": SAMPLE_POSTHOG_EVENT})
@@ -91,14 +92,12 @@ async def test_ingest_success(mocker: MockerFixture, client: TestClient) -> None
     assert event_arg.distinct_id == "user-123"
 
 
-@pytest.mark.asyncio
 async def test_ingest_invalid_payload(client: TestClient) -> None:
     invalid_payload = {"event": "$pageview"}  # Missing required fields
     response = client.post("/ingest", json={"event": invalid_payload})
     assert response.status_code == 422
 
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize(
     "payload, expected_status",
     [
@@ -106,7 +105,7 @@ async def test_ingest_invalid_payload(client: TestClient) -> None:
             {
                 "distinct_id": "user-123",
                 "properties": {},
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": FIXED_TIMESTAMP,
             },
             422,
             id="missing_fields",
@@ -130,16 +129,13 @@ async def test_ingest_error(client: TestClient, payload: dict[str, Any], expecte
     assert response.status_code == expected_status
 
 
-@pytest.mark.asyncio
 async def test_get_context_api(mocker: MockerFixture, client: TestClient) -> None:
     """Test getting context for user with existing session"""
 
     mocker.patch("app.api.routes.fetch_recent_events", new_callable=AsyncMock, return_value=SAMPLE_ENRICHED_EVENTS)
     mocker.patch("app.api.routes.fetch_latest_session", new_callable=AsyncMock, return_value=SAMPLE_SESSION)
     mocker.patch("app.api.routes.fetch_session_events", new_callable=AsyncMock, return_value=SAMPLE_ENRICHED_EVENTS)
-    mocker.patch(
-        "app.api.routes.generate_events_summary", new_callable=AsyncMock, return_value="Viewed 2 pages. Clicked 1 time."
-    )
+    mocker.patch("app.api.routes.generate_events_summary", return_value="Viewed 2 pages. Clicked 1 time.")
     mock_pattern = Pattern(code="test_pattern", description="Test pattern detected", severity=Severity.low)
     mock_engine = mocker.MagicMock()
     mock_engine.detect.return_value = [mock_pattern]
@@ -158,7 +154,6 @@ async def test_get_context_api(mocker: MockerFixture, client: TestClient) -> Non
     assert data["patterns"][0]["code"] == "test_pattern"
 
 
-@pytest.mark.asyncio
 async def test_get_context_without_session(mocker: MockerFixture, client: TestClient) -> None:
     """Test getting context for user without session"""
 
@@ -174,7 +169,6 @@ async def test_get_context_without_session(mocker: MockerFixture, client: TestCl
     assert data["patterns"] == []
 
 
-@pytest.mark.asyncio
 async def test_get_context_empty_recent_events(
     mocker: MockerFixture,
     client: TestClient,
@@ -193,13 +187,12 @@ async def test_get_context_empty_recent_events(
     assert data["patterns"] == []
 
 
-@pytest.mark.asyncio
 async def test_get_context_multiple_patterns(mocker: MockerFixture, client: TestClient) -> None:
     """Test getting context with multiple patterns detected"""
     mocker.patch("app.api.routes.fetch_recent_events", new_callable=AsyncMock, return_value=SAMPLE_ENRICHED_EVENTS)
     mocker.patch("app.api.routes.fetch_latest_session", new_callable=AsyncMock, return_value=SAMPLE_SESSION)
     mocker.patch("app.api.routes.fetch_session_events", new_callable=AsyncMock, return_value=SAMPLE_ENRICHED_EVENTS)
-    mocker.patch("app.api.routes.generate_events_summary", new_callable=AsyncMock, return_value="Session summary")
+    mocker.patch("app.api.routes.generate_events_summary", return_value="Session summary")
     patterns = [
         Pattern(code="pattern1", description="Pattern 1", severity=Severity.high),
         Pattern(code="pattern2", description="Pattern 2", severity=Severity.medium),
@@ -217,7 +210,6 @@ async def test_get_context_multiple_patterns(mocker: MockerFixture, client: Test
     assert {p["code"] for p in data["patterns"]} == {"pattern1", "pattern2", "pattern3"}
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 async def test_full_flow_ingest_then_context(mocker: MockerFixture, client: TestClient) -> None:
     """Integration test: ingest event then fetch context"""
@@ -233,7 +225,7 @@ async def test_full_flow_ingest_then_context(mocker: MockerFixture, client: Test
     mocker.patch("app.api.routes.fetch_recent_events", new_callable=AsyncMock, return_value=SAMPLE_ENRICHED_EVENTS)
     mocker.patch("app.api.routes.fetch_latest_session", new_callable=AsyncMock, return_value=SAMPLE_SESSION)
     mocker.patch("app.api.routes.fetch_session_events", new_callable=AsyncMock, return_value=SAMPLE_ENRICHED_EVENTS)
-    mocker.patch("app.api.routes.generate_events_summary", new_callable=AsyncMock, return_value="Summary")
+    mocker.patch("app.api.routes.generate_events_summary", return_value="Summary")
 
     mock_engine = mocker.MagicMock()
     mock_engine.detect.return_value = []
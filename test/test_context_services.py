@@ -1,5 +1,6 @@
 from datetime import datetime
-from uuid import UUID, uuid4
+from typing import Any
+from uuid import UUID
 
 import pytest
 from pytest import mark, param
@@ -8,6 +9,23 @@ from app.models import ActionType, EnrichedEvent, EventType, RawEvent
 from app.services.context_services import build_context, generate_events_summary
 from app.services.event_parsing import ParsedElements
 
+# Summaries don't depend on ids or time, constants avoid generating them for every test event
+SAMPLE_UUID = UUID("12345678123456781234567812345678")
+FIXED_TIMESTAMP = datetime(2020, 1, 1)
+
+
+def _make_event(**overrides: Any) -> EnrichedEvent:
+    """Build enriched event from trusted test data, skipping pydantic validation"""
+    fields = {
+        "enriched_event_id": SAMPLE_UUID,
+        "raw_event_id": SAMPLE_UUID,
+        "user_id": "u1",
+        "session_id": "s1",
+        "timestamp": FIXED_TIMESTAMP,
+        **overrides,
+    }
+    return EnrichedEvent.model_construct(**fields)
+
 
 @mark.parametrize(
     "event_properties,element_info,event_name,expected",
@@ -98,8 +116,7 @@ from app.services.event_parsing import ParsedElements
         ),
     ],
 )
-@mark.asyncio
-async def test_build_context(
+def test_build_context(
     event_properties: dict,
     element_info: ParsedElements,
     event_name: str | None,
@@ -116,12 +133,11 @@ async def test_build_context(
         status="PENDING",
     )
 
-    result = await build_context(raw_event.event_name, raw_event.properties, element_info)
+    result = build_context(raw_event.event_name, raw_event.properties, element_info)
     assert result == expected
 
 
-@mark.asyncio
-async def test_build_context_attribute_override() -> None:
+def test_build_context_attribute_override() -> None:
     """Test that element attributes override properties with same key"""
     raw_event = RawEvent(
         raw_event_id=UUID("12345678123456781234567812345678"),
@@ -133,7 +149,7 @@ async def test_build_context_attribute_override() -> None:
     )
 
     element_info = ParsedElements(attributes={"product-id": "new"})
-    result = await build_context(raw_event.event_name, raw_event.properties, element_info)
+    result = build_context(raw_event.event_name, raw_event.properties, element_info)
 
     # Element attribute should override property
     assert result["product_id"] == "new"
@@ -149,12 +165,7 @@ async def test_build_context_attribute_override() -> None:
         ),
         pytest.param(
             [
-                EnrichedEvent(
-                    enriched_event_id=uuid4(),
-                    raw_event_id=uuid4(),
-                    user_id="u1",
-                    session_id="s1",
-                    timestamp=datetime.utcnow(),
+                _make_event(
                     event_name="$pageview",
                     event_type=EventType.pageview,
                     semantic_label="Viewed home",
@@ -168,12 +179,7 @@ async def test_build_context_attribute_override() -> None:
         ),
         pytest.param(
             [
-                EnrichedEvent(
-                    enriched_event_id=uuid4(),
-                    raw_event_id=uuid4(),
-                    user_id="u1",
-                    session_id="s1",
-                    timestamp=datetime.utcnow(),
+                _make_event(
                     event_name="$autocapture",
                     event_type=EventType.click,
                     semantic_label="Clicked",
@@ -186,29 +192,22 @@ async def test_build_context_attribute_override() -> None:
         ),
     ],
 )
-@pytest.mark.asyncio
-async def test_generate_events_summary_basic_cases(
+def test_generate_events_summary_basic_cases(
     events: list[EnrichedEvent],
     expected_summary: str,
 ) -> None:
     """Test generate_events_summary with basic event combinations"""
 
-    summary = await generate_events_summary(events)
+    summary = generate_events_summary(events)
 
     assert expected_summary in summary
 
 
-@pytest.mark.asyncio
-async def test_generate_events_summary_multiple_pageviews() -> None:
+def test_generate_events_summary_multiple_pageviews() -> None:
     """Test summary with multiple pageviews"""
 
     events = [
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$pageview",
             event_type=EventType.pageview,
             semantic_label="Viewed",
@@ -216,12 +215,7 @@ async def test_generate_events_summary_multiple_pageviews() -> None:
             page_title="Home",
             sequence_number=1,
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$pageview",
             event_type=EventType.pageview,
             semantic_label="Viewed",
@@ -229,12 +223,7 @@ async def test_generate_events_summary_multiple_pageviews() -> None:
             page_title="Products",
             sequence_number=2,
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$pageview",
             event_type=EventType.pageview,
             semantic_label="Viewed",
@@ -244,7 +233,7 @@ async def test_generate_events_summary_multiple_pageviews() -> None:
         ),
     ]
 
-    summary = await generate_events_summary(events)
+    summary = generate_events_summary(events)
 
     assert "Viewed 3 pages" in summary
     assert "Home" in summary
@@ -252,17 +241,11 @@ async def test_generate_events_summary_multiple_pageviews() -> None:
     assert "Checkout" in summary
 
 
-@pytest.mark.asyncio
-async def test_generate_events_summary_limits_pages_to_three() -> None:
+def test_generate_events_summary_limits_pages_to_three() -> None:
     """Test that summary shows max 3 page titles"""
 
     events = [
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$pageview",
             event_type=EventType.pageview,
             semantic_label="Viewed",
@@ -273,7 +256,7 @@ async def test_generate_events_summary_limits_pages_to_three() -> None:
         for i in range(1, 6)  # 5 pages
     ]
 
-    summary = await generate_events_summary(events)
+    summary = generate_events_summary(events)
 
     assert "Viewed 5 pages" in summary
     # Should show only first 3
@@ -285,17 +268,11 @@ async def test_generate_events_summary_limits_pages_to_three() -> None:
     assert "Page 5" not in summary
 
 
-@pytest.mark.asyncio
-async def test_generate_events_summary_deduplicates_page_titles() -> None:
+def test_generate_events_summary_deduplicates_page_titles() -> None:
     """Test that duplicate page titles are shown once"""
 
     events = [
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$pageview",
             event_type=EventType.pageview,
             semantic_label="Viewed",
@@ -303,12 +280,7 @@ async def test_generate_events_summary_deduplicates_page_titles() -> None:
             page_title="Home",
             sequence_number=1,
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$pageview",
             event_type=EventType.pageview,
             semantic_label="Viewed",
@@ -318,36 +290,25 @@ async def test_generate_events_summary_deduplicates_page_titles() -> None:
         ),
     ]
 
-    summary = await generate_events_summary(events)
+    summary = generate_events_summary(events)
 
     assert "Viewed 2 pages" in summary
     # Should mention "Home" only once
     assert summary.count("Home") == 1
 
 
-@pytest.mark.asyncio
-async def test_generate_events_summary_with_rage_clicks() -> None:
+def test_generate_events_summary_with_rage_clicks() -> None:
     """Test summary includes rage click detection"""
 
     events = [
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$rageclick",
             event_type=EventType.click,
             semantic_label="Rage clicked",
             action_type=ActionType.rage_click,
             sequence_number=1,
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$rageclick",
             event_type=EventType.click,
             semantic_label="Rage clicked",
@@ -356,34 +317,20 @@ async def test_generate_events_summary_with_rage_clicks() -> None:
         ),
     ]
 
-    summary = await generate_events_summary(events)
+    summary = generate_events_summary(events)
 
     assert "Rage-clicked 2 times" in summary
     assert "frustration detected" in summary
 
 
-@pytest.mark.asyncio
-async def test_generate_events_summary_with_custom_events() -> None:
+def test_generate_events_summary_with_custom_events() -> None:
     """Test summary includes custom events count"""
 
     events = [
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
-            event_name="product_added",
-            event_type=EventType.custom,
-            semantic_label="Added product",
-            sequence_number=1,
+        _make_event(
+            event_name="product_added", event_type=EventType.custom, semantic_label="Added product", sequence_number=1
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="checkout_started",
             event_type=EventType.custom,
             semantic_label="Started checkout",
@@ -391,22 +338,16 @@ async def test_generate_events_summary_with_custom_events() -> None:
         ),
     ]
 
-    summary = await generate_events_summary(events)
+    summary = generate_events_summary(events)
 
     assert "Triggered 2 custom events" in summary
 
 
-@pytest.mark.asyncio
-async def test_generate_events_summary_complete_session() -> None:
+def test_generate_events_summary_complete_session() -> None:
     """Test summary with all event types"""
 
     events = [
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$pageview",
             event_type=EventType.pageview,
             semantic_label="Viewed",
@@ -414,12 +355,7 @@ async def test_generate_events_summary_complete_session() -> None:
             page_title="Home",
             sequence_number=1,
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$pageview",
             event_type=EventType.pageview,
             semantic_label="Viewed",
@@ -427,44 +363,26 @@ async def test_generate_events_summary_complete_session() -> None:
             page_title="Products",
             sequence_number=2,
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$autocapture",
             event_type=EventType.click,
             semantic_label="Clicked",
             action_type=ActionType.click,
             sequence_number=3,
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
+        _make_event(
             event_name="$rageclick",
             event_type=EventType.click,
             semantic_label="Rage clicked",
             action_type=ActionType.rage_click,
             sequence_number=4,
         ),
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
-            event_name="product_added",
-            event_type=EventType.custom,
-            semantic_label="Added product",
-            sequence_number=5,
+        _make_event(
+            event_name="product_added", event_type=EventType.custom, semantic_label="Added product", sequence_number=5
         ),
     ]
 
-    summary = await generate_events_summary(events)
+    summary = generate_events_summary(events)
 
     # All parts should be present
     assert "Viewed 2 pages" in summary
@@ -475,42 +393,43 @@ async def test_generate_events_summary_complete_session() -> None:
     assert "Triggered 1 custom event" in summary
 
 
-@pytest.mark.asyncio
-async def test_generate_events_summary_no_significant_activity() -> None:
+def test_generate_events_summary_singular_forms() -> None:
+    """Test that single occurrences aren't pluralized"""
+    events = [
+        _make_event(
+            event_name="$pageview", event_type=EventType.pageview, action_type=ActionType.view, page_title="Home"
+        ),
+        _make_event(event_name="$rageclick", event_type=EventType.click, action_type=ActionType.rage_click),
+        _make_event(event_name="product_added", event_type=EventType.custom, action_type=ActionType.click),
+    ]
+
+    summary = generate_events_summary(events)
+
+    assert summary == (
+        "Viewed 1 page including Home. Clicked 1 time. Rage-clicked 1 time (frustration detected). "
+        "Triggered 1 custom event."
+    )
+
+
+def test_generate_events_summary_no_significant_activity() -> None:
     """Test summary when no significant events"""
 
     # Events with no standard types
     events = [
-        EnrichedEvent(
-            enriched_event_id=uuid4(),
-            raw_event_id=uuid4(),
-            user_id="u1",
-            session_id="s1",
-            timestamp=datetime.utcnow(),
-            event_name="unknown",
-            event_type=EventType.unknown,
-            semantic_label="Unknown",
-            sequence_number=1,
-        ),
+        _make_event(event_name="unknown", event_type=EventType.unknown, semantic_label="Unknown", sequence_number=1),
     ]
 
-    summary = await generate_events_summary(events)
+    summary = generate_events_summary(events)
 
     assert summary == "No significant activity."
 
 
-@pytest.mark.asyncio
-async def test_generate_events_summary_ends_with_period() -> None:
+def test_generate_events_summary_ends_with_period() -> None:
     """Test that summary always ends with a period"""
 
     test_cases = [
         [
-            EnrichedEvent(
-                enriched_event_id=uuid4(),
-                raw_event_id=uuid4(),
-                user_id="u1",
-                session_id="s1",
-                timestamp=datetime.utcnow(),
+            _make_event(
                 event_name="$pageview",
                 event_type=EventType.pageview,
                 semantic_label="Viewed",
@@ -519,21 +438,9 @@ async def test_generate_events_summary_ends_with_period() -> None:
                 sequence_number=1,
             )
         ],
-        [
-            EnrichedEvent(
-                enriched_event_id=uuid4(),
-                raw_event_id=uuid4(),
-                user_id="u1",
-                session_id="s1",
-                timestamp=datetime.utcnow(),
-                event_name="custom",
-                event_type=EventType.custom,
-                semantic_label="Custom",
-                sequence_number=1,
-            )
-        ],
+        [_make_event(event_name="custom", event_type=EventType.custom, semantic_label="Custom", sequence_number=1)],
     ]
 
     for events in test_cases:
-        summary = await generate_events_summary(events)
+        summary = generate_events_summary(events)
         assert summary.endswith(".")
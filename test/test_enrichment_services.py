@@ -171,8 +171,7 @@ SAMPLE_RAW_EVENT = RawEvent(
         ),
     ],
 )
-@pytest.mark.asyncio
-async def test_enrich_event(
+def test_enrich_event(
     mocker: MockerFixture,
     parsed_elements: ParsedElements,
     classification: EventClassification,
@@ -206,7 +205,7 @@ async def test_enrich_event(
     )
 
     # Execute
-    actual = await enrich_event(SAMPLE_RAW_EVENT, SAMPLE_SESSION)
+    actual = enrich_event(SAMPLE_RAW_EVENT, SAMPLE_SESSION)
 
     # Verify entire enriched event matches expected
     assert actual == expected
@@ -221,8 +220,7 @@ async def test_enrich_event(
         pytest.param(999, 1000, id="thousandth_event"),
     ],
 )
-@pytest.mark.asyncio
-async def test_enrich_event_sequence_number(
+def test_enrich_event_sequence_number(
     mocker: MockerFixture,
     session_event_count: int,
     expected_sequence: int,
@@ -266,14 +264,13 @@ async def test_enrich_event_sequence_number(
     )
 
     # Execute
-    enriched = await enrich_event(SAMPLE_RAW_EVENT, session)
+    enriched = enrich_event(SAMPLE_RAW_EVENT, session)
 
     # Verify sequence number
     assert enriched.sequence_number == expected_sequence
 
 
-@pytest.mark.asyncio
-async def test_enrich_event_calls_services_with_correct_args(mocker: MockerFixture) -> None:
+def test_enrich_event_calls_services_with_correct_args(mocker: MockerFixture) -> None:
     """Test that enrich_event calls all services with correct arguments"""
 
     # Mock all services
@@ -299,7 +296,7 @@ async def test_enrich_event_calls_services_with_correct_args(mocker: MockerFixtu
     )
 
     # Execute
-    await enrich_event(SAMPLE_RAW_EVENT, SAMPLE_SESSION)
+    enrich_event(SAMPLE_RAW_EVENT, SAMPLE_SESSION)
 
     # Verify service calls with correct arguments
     mock_parse.assert_called_once_with(chain=SAMPLE_RAW_EVENT.elements_chain)
@@ -309,4 +306,4 @@ async def test_enrich_event_calls_services_with_correct_args(mocker: MockerFixtu
     )
     mock_extract.assert_called_once_with(properties=SAMPLE_RAW_EVENT.properties)
     mock_label.assert_called_once()
-    mock_context.assert_awaited_once()
+    mock_context.assert_called_once()
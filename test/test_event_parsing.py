@@ -1,4 +1,6 @@
-from pytest import mark, param
+from dataclasses import FrozenInstanceError
+
+from pytest import mark, param, raises
 
 from app.services.event_parsing import (
     ActionType,
@@ -194,6 +196,11 @@ from app.services.event_parsing import (
             ),
             id="test_extraction_of_multiple_custom_attributes",
         ),
+        param(
+            'button:attr__data-ph-capture-attribute-ok="1"attr__data-ph-capture-attribute-bad="unterminated',
+            ParsedElements(element_type="button", element_text=None, attributes={"ok": "1"}, hierarchy=["button"]),
+            id="unterminated_attribute_skipped",
+        ),
     ],
 )
 def test_parse_elements_chain(chain: str, expected: ParsedElements) -> None:
@@ -208,6 +215,19 @@ def test_parse_elements_chain_hierarchy_limit() -> None:
     assert result.hierarchy == ["a", "b", "c", "d", "e"]
 
 
+def test_parsed_elements_are_immutable() -> None:
+    result = parse_elements_chain('button:text="Buy"')
+
+    with raises(FrozenInstanceError):
+        result.element_text = "Sell"
+
+
+def test_parse_elements_chain_is_cached() -> None:
+    chain = 'button.cart:text="Add to cart";div;main'
+
+    assert parse_elements_chain(chain) is parse_elements_chain(chain)
+
+
 @mark.parametrize(
     "event_name,properties,expected",
     [
@@ -351,6 +371,18 @@ def test_classify_event(event_name: str, properties: dict, expected: EventClassi
     assert classify_event(event_name, properties) == expected
 
 
+def test_classify_event_is_cached() -> None:
+    properties = {"$event_type": "submit", "$pathname": "/checkout"}
+
+    assert classify_event("$autocapture", properties) is classify_event("$autocapture", {"$event_type": "submit"})
+
+
+def test_classify_event_unhashable_autocapture_type() -> None:
+    result = classify_event("$autocapture", {"$event_type": ["click"]})
+
+    assert result == EventClassification(event_type=EventType.click, action_type=ActionType.click)
+
+
 @mark.parametrize(
     "event_name,expected",
     [
@@ -370,6 +402,9 @@ def test_classify_event(event_name: str, properties: dict, expected: EventClassi
         param("upgrade_started", ActionType.navigate, id="started"),
         param("dashboard_viewed", ActionType.navigate, id="viewed"),
         param("settings_navigated", ActionType.navigate, id="navigated"),
+        # Keyword groups precedence
+        param("submit_button_clicked", ActionType.click, id="click_before_submit"),
+        param("checkout_started_completed", ActionType.submit, id="submit_before_navigate"),
         # Default fallback
         param("random_event", ActionType.click, id="default"),
         param("some_action", ActionType.click, id="default_action"),
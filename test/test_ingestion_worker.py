@@ -1,184 +1,280 @@
-from datetime import datetime
-from test.helpers import AsyncContextManagerMock
+import asyncio
+from functools import partial
+from test.helpers import AsyncContextManagerMock, CountingAsyncStub
+from typing import Callable
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
 from pytest_mock import MockerFixture
-
-from app.models import EnrichedEventCreate, RawEvent, RawEventStatus, Session
-from app.workers.ingestion_worker import process_batch, process_single_event, process_with_semaphore
-
-SAMPLE_RAW_EVENT = RawEvent(
-    raw_event_id=str(uuid4()),
-    event_name="$pageview",
-    user_id="user-123",
-    timestamp=datetime(2020, 1, 1),
-    properties={
-        "$session_id": "session-456",
-        "$pathname": "/home",
-        "title": "Home Page",
-    },
-    status=RawEventStatus.pending,
-    elements_chain=None,
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.models import EnrichedEventCreate, RawEvent, Session
+from app.workers import ingestion_worker
+from app.workers.ingestion_worker import (
+    NEW_RAW_EVENT_CHANNEL,
+    ProcessedEventsBuffer,
+    RawEventListener,
+    event_worker,
+    on_listener_terminated,
+    on_raw_event_inserted,
+    process_batch,
+    process_event,
+    process_single_event,
+    raw_event_inserted,
 )
 
-SAMPLE_SESSION = Session(
-    session_id="session-456",
-    user_id="user-123",
-    started_at=datetime.utcnow(),
-    last_activity_at=datetime.utcnow(),
-    event_count=5,
-    page_views_count=2,
-    clicks_count=3,
-    first_page="/home",
-    last_page="/about",
-    is_active=True,
-    created_at=datetime.utcnow(),
-    updated_at=datetime.utcnow(),
-)
 
-SAMPLE_ENRICHED_EVENT = EnrichedEventCreate(
-    raw_event_id=uuid4(),
-    user_id="user-123",
-    session_id="session-456",
-    timestamp=datetime.utcnow(),
-    event_name="$pageview",
-    event_type="pageview",
-    action_type="view",
-    semantic_label="Viewed home page",
-    page_path="/home",
-    page_title="Home Page",
-    element_type=None,
-    element_text=None,
-    context={},
-    sequence_number=6,
-)
+@pytest.fixture
+def ingestion_mocks(
+    mocker: MockerFixture, sample_session: Session, sample_enriched_event: EnrichedEventCreate
+) -> dict[str, MagicMock | CountingAsyncStub]:
+    """Mock all services used by the worker with a single patch"""
+    mocks = {
+        "get_or_create_session": AsyncMock(return_value=sample_session),
+        "enrich_event": MagicMock(return_value=sample_enriched_event),
+        "update_session_activity": CountingAsyncStub(),
+        "create_enriched_events": AsyncMock(),
+        "mark_events_as_done": AsyncMock(),
+        "mark_events_as_failed": AsyncMock(),
+    }
+    mocker.patch.multiple(ingestion_worker, **mocks)
+    return mocks
 
 
 @pytest.fixture
-def mock_main_transaction(mocker: MockerFixture) -> None:
-    mocker.patch("app.workers.ingestion_worker.get_transaction", new=lambda: AsyncContextManagerMock())
+def patch_worker(mocker: MockerFixture) -> Callable[..., MagicMock]:
+    """Patch attribute of the ingestion worker module directly, without resolving a dotted path"""
+    return partial(mocker.patch.object, ingestion_worker)
 
 
-@pytest.mark.asyncio
-async def test_process_single_event_success(mocker: MockerFixture, mock_connection: AsyncMock) -> None:
-    """Test successful processing of a single event"""
+@pytest.fixture
+def mock_flush_transaction(patch_worker: Callable[..., MagicMock], mock_connection: AsyncMock) -> None:
+    """Run the buffer's own flush transactions on the mocked connection"""
+    patch_worker("get_transaction", new=lambda: AsyncContextManagerMock(return_value=mock_connection))
 
-    mock_get_session = mocker.patch("app.workers.ingestion_worker.get_or_create_session", return_value=SAMPLE_SESSION)
-    mock_enrich = mocker.patch("app.workers.ingestion_worker.enrich_event", return_value=SAMPLE_ENRICHED_EVENT)
-    mock_create = mocker.patch("app.workers.ingestion_worker.create_enriched_event")
-    mock_update = mocker.patch("app.workers.ingestion_worker.update_session_activity")
-    mock_mark_done = mocker.patch("app.workers.ingestion_worker.mark_event_as_done")
 
-    await process_single_event(mock_connection, SAMPLE_RAW_EVENT)
+@pytest.fixture(scope="session")
+def noop_context_manager() -> AsyncContextManagerMock:
+    """Stateless async context manager, safe to share between tests"""
+    return AsyncContextManagerMock()
 
-    mock_get_session.assert_awaited_once_with(connection=mock_connection, event=SAMPLE_RAW_EVENT)
-    mock_enrich.assert_awaited_once_with(event=SAMPLE_RAW_EVENT, session=SAMPLE_SESSION)
-    mock_create.assert_awaited_once_with(connection=mock_connection, input_data=SAMPLE_ENRICHED_EVENT)
-    mock_update.assert_awaited_once()
-    mock_mark_done.assert_awaited_once_with(connection=mock_connection, event_id=SAMPLE_RAW_EVENT.raw_event_id)
 
+@pytest.fixture
+def mock_main_transaction(
+    patch_worker: Callable[..., MagicMock], noop_context_manager: AsyncContextManagerMock
+) -> None:
+    """Replace the worker's own transactions (fetch and flush) with a no-op context manager"""
+    patch_worker("get_transaction", new=lambda: noop_context_manager)
 
-@pytest.mark.asyncio
-async def test_process_single_event_missing_session_id(mock_connection: AsyncMock) -> None:
-    """Test handling of event without session_id"""
-    event = RawEvent(
-        raw_event_id=str(uuid4()),
-        event_name="$pageview",
-        user_id="user-123",
-        timestamp=datetime(2020, 1, 1),
-        properties={},
-        status=RawEventStatus.pending,
-    )
-    with pytest.raises(ValueError):
-        await process_single_event(mock_connection, event)
 
+@pytest.fixture(scope="session")
+def batch_events_factory(_raw_event_template: RawEvent) -> Callable[[int], list[RawEvent]]:
+    """Read-only batches of sample raw events, cached by size"""
+    cache: dict[int, list[RawEvent]] = {}
 
-@pytest.mark.asyncio
-async def test_process_single_event_enrichment_fails(mocker: MockerFixture, mock_connection: AsyncMock) -> None:
-    """Test handling when enrichment fails"""
+    def make(size: int) -> list[RawEvent]:
+        return cache.setdefault(size, [_raw_event_template] * size)
 
-    mocker.patch("app.workers.ingestion_worker.get_or_create_session", return_value=SAMPLE_SESSION)
-    mocker.patch("app.workers.ingestion_worker.enrich_event", side_effect=Exception())
+    return make
 
-    with pytest.raises(Exception):
-        await process_single_event(mock_connection, SAMPLE_RAW_EVENT)
 
+async def test_process_single_event_success(
+    ingestion_mocks: dict[str, MagicMock | CountingAsyncStub],
+    mock_connection: AsyncMock,
+    sample_raw_event: RawEvent,
+    sample_session: Session,
+    sample_enriched_event: EnrichedEventCreate,
+) -> None:
+    """Test successful processing of a single event"""
 
-@pytest.mark.asyncio
-async def test_process_with_semaphore_success(mocker: MockerFixture) -> None:
-    """Test successful processing with semaphore"""
+    result = await process_single_event(mock_connection, sample_raw_event)
 
-    mocker.patch("app.workers.ingestion_worker.get_connection", new=lambda: AsyncContextManagerMock())
-    mock_process = mocker.patch("app.workers.ingestion_worker.process_single_event")
-    mock_mark_failed = mocker.patch("app.workers.ingestion_worker.mark_event_as_failed")
+    ingestion_mocks["get_or_create_session"].assert_awaited_once_with(
+        connection=mock_connection, event=sample_raw_event
+    )
+    ingestion_mocks["enrich_event"].assert_called_once_with(event=sample_raw_event, session=sample_session)
+    assert ingestion_mocks["update_session_activity"].await_count == 1
+    ingestion_mocks["mark_events_as_done"].assert_awaited_once_with(mock_connection, [sample_raw_event.raw_event_id])
+    assert result == sample_enriched_event
 
-    await process_with_semaphore(SAMPLE_RAW_EVENT)
 
-    mock_process.assert_awaited_once()
-    mock_mark_failed.assert_not_awaited()
+async def test_process_single_event_missing_session_id(mock_connection: AsyncMock, sample_raw_event: RawEvent) -> None:
+    """Test handling of event without session_id"""
+    sample_raw_event.properties = {}
+
+    with pytest.raises(ValueError):
+        await process_single_event(mock_connection, sample_raw_event)
 
 
-@pytest.mark.asyncio
-async def test_process_with_semaphore_failure_marks_as_failed(mocker: MockerFixture) -> None:
-    """Test that failed events are marked as failed"""
-    conn_begin = MagicMock()
-    mocker.patch(
-        "app.workers.ingestion_worker.get_connection",
-        new=lambda: AsyncContextManagerMock(return_value=conn_begin),
+async def test_process_single_event_enrichment_fails(
+    ingestion_mocks: dict[str, MagicMock | CountingAsyncStub], mock_connection: AsyncMock, sample_raw_event: RawEvent
+) -> None:
+    """Test handling when enrichment fails"""
+    ingestion_mocks["enrich_event"].side_effect = Exception()
+
+    with pytest.raises(Exception):
+        await process_single_event(mock_connection, sample_raw_event)
+
+
+async def test_process_event_success(
+    patch_worker: Callable[..., MagicMock],
+    mock_connection: AsyncMock,
+    sample_raw_event: RawEvent,
+    sample_enriched_event: EnrichedEventCreate,
+) -> None:
+    """Test that successfully processed events are buffered for bulk insert"""
+
+    mock_process = patch_worker("process_single_event", return_value=sample_enriched_event)
+    events_buffer = ProcessedEventsBuffer()
+
+    await process_event(mock_connection, sample_raw_event, events_buffer)
+
+    mock_process.assert_awaited_once_with(mock_connection, sample_raw_event)
+    assert events_buffer.enriched_events == [sample_enriched_event]
+    assert events_buffer.failed_ids == []
+
+
+async def test_process_event_failure_marks_as_failed(
+    patch_worker: Callable[..., MagicMock], mock_connection: AsyncMock, sample_raw_event: RawEvent
+) -> None:
+    """Test that failed events are buffered as failed"""
+    patch_worker("process_single_event", side_effect=Exception())
+    events_buffer = ProcessedEventsBuffer()
+
+    await process_event(mock_connection, sample_raw_event, events_buffer)
+
+    assert events_buffer.enriched_events == []
+    assert events_buffer.failed_ids == [sample_raw_event.raw_event_id]
+
+
+@pytest.mark.usefixtures("mock_flush_transaction")
+async def test_events_buffer_flush(
+    ingestion_mocks: dict[str, MagicMock | CountingAsyncStub],
+    mock_connection: AsyncMock,
+    sample_enriched_event: EnrichedEventCreate,
+) -> None:
+    """Test that flush inserts enriched events, marks failed ones with a single update and skips empty buffers"""
+    mock_create = ingestion_mocks["create_enriched_events"]
+    mock_mark_done = ingestion_mocks["mark_events_as_done"]
+    mock_mark_failed = ingestion_mocks["mark_events_as_failed"]
+    failed_ids = [uuid4()]
+    events_buffer = ProcessedEventsBuffer()
+    events_buffer.enriched_events.append(sample_enriched_event)
+    events_buffer.failed_ids.extend(failed_ids)
+
+    await events_buffer.flush()
+    await events_buffer.flush()
+
+    mock_create.assert_awaited_once_with(mock_connection, [sample_enriched_event])
+    mock_mark_done.assert_not_awaited()  # already done in each event's own transaction
+    mock_mark_failed.assert_awaited_once_with(mock_connection, failed_ids)
+
+
+@pytest.mark.usefixtures("mock_flush_transaction")
+async def test_events_buffer_flush_failure_marks_all_events_as_failed(
+    ingestion_mocks: dict[str, MagicMock | CountingAsyncStub],
+    mock_connection: AsyncMock,
+    sample_enriched_event: EnrichedEventCreate,
+) -> None:
+    """Test that events of a failed flush are marked as failed instead of being left pending and counted again"""
+    ingestion_mocks["create_enriched_events"].side_effect = Exception()
+    failed_ids = [uuid4()]
+    events_buffer = ProcessedEventsBuffer()
+    events_buffer.enriched_events.append(sample_enriched_event)
+    events_buffer.failed_ids.extend(failed_ids)
+
+    await events_buffer.flush()
+
+    # the rolled back transaction marked the failed ones first, so all of them are marked again
+    ingestion_mocks["mark_events_as_failed"].assert_awaited_with(
+        mock_connection, [sample_enriched_event.raw_event_id, *failed_ids]
     )
-    mocker.patch("app.workers.ingestion_worker.process_single_event", side_effect=Exception())
-    mock_mark_failed = mocker.patch("app.workers.ingestion_worker.mark_event_as_failed")
+    assert events_buffer.enriched_events == []
+    assert events_buffer.failed_ids == []
+
 
-    await process_with_semaphore(SAMPLE_RAW_EVENT)
+async def test_event_worker_survives_unexpected_errors(
+    patch_worker: Callable[..., MagicMock], mock_connection: AsyncMock, sample_raw_event: RawEvent
+) -> None:
+    """Test that worker keeps consuming the queue even if handling an event blows up"""
+    mock_process = patch_worker("process_event", side_effect=[Exception(), None])
+    queue = asyncio.Queue()
+    queue.put_nowait(sample_raw_event)
+    queue.put_nowait(sample_raw_event)
 
-    mock_mark_failed.assert_awaited_once_with(conn_begin, SAMPLE_RAW_EVENT.raw_event_id)
+    worker = asyncio.create_task(event_worker(mock_connection, queue, ProcessedEventsBuffer()))
+    try:
+        await asyncio.wait_for(queue.join(), timeout=1)
+    finally:
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)  # the event loop is shared by the whole session
+
+    assert mock_process.await_count == 2
 
 
-@pytest.mark.asyncio
 @pytest.mark.usefixtures("mock_main_transaction")
-async def test_process_batch_with_events(mocker: MockerFixture) -> None:
-    """Test processing a batch of events"""
+async def test_process_batch_with_events(
+    patch_worker: Callable[..., MagicMock], batch_events_factory: Callable[[int], list[RawEvent]]
+) -> None:
+    """Test that batch events are queued for workers and awaited"""
 
-    events = [SAMPLE_RAW_EVENT for _ in range(3)]
+    events = batch_events_factory(3)
 
     # Setup mocks
-    mocker.patch("app.workers.ingestion_worker.fetch_events_for_processing", return_value=events)
-    mock_process = mocker.patch("app.workers.ingestion_worker.process_with_semaphore")
+    patch_worker("fetch_events_for_processing", return_value=events)
+    queue = AsyncMock(spec=asyncio.Queue)
+    events_buffer = AsyncMock(spec=ProcessedEventsBuffer)
 
     # Execute
-    result = await process_batch()
+    result = await process_batch(queue, events_buffer)
 
     # Verify
     assert result == 3
-    assert mock_process.await_count == 3
+    assert queue.put_nowait.call_count == 3
+    queue.join.assert_awaited_once()
+    events_buffer.flush.assert_awaited_once()
+
+
+@pytest.mark.usefixtures("mock_main_transaction")
+async def test_process_batch_survives_flush_failure(
+    patch_worker: Callable[..., MagicMock], batch_events_factory: Callable[[int], list[RawEvent]]
+) -> None:
+    """Test that a failing flush is logged and doesn't stop the main loop"""
+    patch_worker("fetch_events_for_processing", return_value=batch_events_factory(3))
+    events_buffer = AsyncMock(spec=ProcessedEventsBuffer)
+    events_buffer.flush.side_effect = Exception()
+
+    assert await process_batch(AsyncMock(spec=asyncio.Queue), events_buffer) == 3
+    events_buffer.flush.assert_awaited_once()
 
 
-@pytest.mark.asyncio
 @pytest.mark.usefixtures("mock_main_transaction")
-async def test_process_batch_empty(mocker: MockerFixture) -> None:
+async def test_process_batch_empty(patch_worker: Callable[..., MagicMock]) -> None:
     """Test processing when no events are available"""
-    mocker.patch("app.workers.ingestion_worker.fetch_events_for_processing", return_value=[])
-    assert await process_batch() == 0
+    patch_worker("fetch_events_for_processing", return_value=[])
+    assert await process_batch(AsyncMock(spec=asyncio.Queue), ProcessedEventsBuffer()) == 0
 
 
-@pytest.mark.asyncio
 @pytest.mark.usefixtures("mock_main_transaction")
-async def test_process_batch_partial_failure(mocker: MockerFixture) -> None:
+async def test_process_batch_partial_failure(
+    patch_worker: Callable[..., MagicMock],
+    mock_connection: AsyncMock,
+    batch_events_factory: Callable[[int], list[RawEvent]],
+) -> None:
     """Test that batch continues processing even if some events fail"""
 
-    events = [SAMPLE_RAW_EVENT for _ in range(5)]
+    events = batch_events_factory(5)
 
     # Mock get_transaction
-    mocker.patch("app.workers.ingestion_worker.fetch_events_for_processing", return_value=events)
+    patch_worker("fetch_events_for_processing", return_value=events)
 
     # Track which events were processed
     processed_events = []
     failed_events = []
 
-    # Mock process_with_semaphore to simulate partial failure
-    async def mock_process(event: RawEvent) -> None:
+    # Mock process_event to simulate partial failure
+    async def mock_process(connection: AsyncConnection, event: RawEvent, events_buffer: ProcessedEventsBuffer) -> None:
         processed_events.append(event.raw_event_id)
 
         # Simulate failure for second event
@@ -187,10 +283,18 @@ async def test_process_batch_partial_failure(mocker: MockerFixture) -> None:
             # Real function catches exception and doesn't re-raise!
             return
 
-    mocker.patch("app.workers.ingestion_worker.process_with_semaphore", side_effect=mock_process)
+    patch_worker("process_event", side_effect=mock_process)
 
     # Execute - should complete all 5 without raising
-    result = await process_batch()
+    queue = asyncio.Queue()
+    events_buffer = ProcessedEventsBuffer()
+    workers = [asyncio.create_task(event_worker(mock_connection, queue, events_buffer)) for _ in range(2)]
+    try:
+        result = await process_batch(queue, events_buffer)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)  # the event loop is shared by the whole session
 
     # Verify all were attempted
     assert result == 5
@@ -198,20 +302,97 @@ async def test_process_batch_partial_failure(mocker: MockerFixture) -> None:
     assert len(failed_events) == 1  # One failed
 
 
-@pytest.mark.asyncio
-async def test_full_event_processing_flow(mocker: MockerFixture, mock_connection: AsyncMock) -> None:
+async def test_full_event_processing_flow(
+    ingestion_mocks: dict[str, MagicMock | CountingAsyncStub], mock_connection: AsyncMock, sample_raw_event: RawEvent
+) -> None:
     """Integration test for full event processing flow"""
 
-    mock_session = mocker.patch("app.workers.ingestion_worker.get_or_create_session", return_value=SAMPLE_SESSION)
-    mock_enrich = mocker.patch("app.workers.ingestion_worker.enrich_event", return_value=SAMPLE_ENRICHED_EVENT)
-    mock_create = mocker.patch("app.workers.ingestion_worker.create_enriched_event")
-    mock_update = mocker.patch("app.workers.ingestion_worker.update_session_activity")
-    mock_mark_done = mocker.patch("app.workers.ingestion_worker.mark_event_as_done")
+    await process_single_event(mock_connection, sample_raw_event)
+
+    assert ingestion_mocks["get_or_create_session"].await_count == 1
+    assert ingestion_mocks["enrich_event"].call_count == 1
+    assert ingestion_mocks["update_session_activity"].await_count == 1
+
+
+def test_on_raw_event_inserted_wakes_up_main_loop() -> None:
+    """Test that NOTIFY listener signals the main loop"""
+    raw_event_inserted.clear()
+
+    on_raw_event_inserted(MagicMock(), 123, "new_raw_event", "")
+
+    assert raw_event_inserted.is_set()
+
+
+@pytest.fixture
+def listener_connections(patch_worker: Callable[..., MagicMock], mock_connection: AsyncMock) -> list[MagicMock]:
+    """asyncpg connections the raw event listener subscribed on, a new one per subscription"""
+    drivers = []
+
+    async def get_raw_connection() -> MagicMock:
+        driver = MagicMock()
+        driver.add_listener = AsyncMock()
+        driver.remove_listener = AsyncMock()
+        driver.is_closed.return_value = False
+        drivers.append(driver)
+        return MagicMock(driver_connection=driver)
+
+    mock_connection.get_raw_connection.side_effect = get_raw_connection
+    patch_worker("get_connection", new=lambda: AsyncContextManagerMock(return_value=mock_connection))
+    return drivers
+
+
+async def test_raw_event_listener_subscribe_and_close(listener_connections: list[MagicMock]) -> None:
+    """Test that listener subscribes to the channel, watches its connection and unsubscribes on close"""
+    listener = RawEventListener()
+
+    await listener.subscribe()
+
+    [driver] = listener_connections
+    driver.add_listener.assert_awaited_once_with(NEW_RAW_EVENT_CHANNEL, on_raw_event_inserted)
+    driver.add_termination_listener.assert_called_once_with(on_listener_terminated)
+    assert listener.is_subscribed
+
+    await listener.close()
+
+    driver.remove_listener.assert_awaited_once_with(NEW_RAW_EVENT_CHANNEL, on_raw_event_inserted)
+    driver.remove_termination_listener.assert_called_once_with(on_listener_terminated)
+    assert not listener.is_subscribed
+
+
+async def test_raw_event_listener_resubscribes_lost_connection(listener_connections: list[MagicMock]) -> None:
+    """Test that a lost listener connection is replaced, without unsubscribing on the dead one"""
+    listener = RawEventListener()
+    await listener.subscribe()
+
+    await listener.ensure_subscribed()
+    assert len(listener_connections) == 1
+
+    (lost,) = listener_connections
+    lost.is_closed.return_value = True
+    await listener.ensure_subscribed()
+
+    _, replacement = listener_connections
+    replacement.add_listener.assert_awaited_once_with(NEW_RAW_EVENT_CHANNEL, on_raw_event_inserted)
+    lost.remove_listener.assert_not_awaited()
+    assert listener.is_subscribed
+
+
+async def test_raw_event_listener_resubscribe_failure_falls_back_to_polling(
+    patch_worker: Callable[..., MagicMock],
+) -> None:
+    """Test that failing to resubscribe is logged instead of stopping the worker"""
+    patch_worker("get_connection", side_effect=OSError())
+    listener = RawEventListener()
+
+    await listener.ensure_subscribed()
+
+    assert not listener.is_subscribed
+
+
+def test_on_listener_terminated_wakes_up_main_loop() -> None:
+    """Test that losing the listener connection wakes the main loop up to resubscribe"""
+    raw_event_inserted.clear()
 
-    await process_single_event(mock_connection, SAMPLE_RAW_EVENT)
+    on_listener_terminated(MagicMock())
 
-    assert mock_session.await_count == 1
-    assert mock_enrich.await_count == 1
-    assert mock_create.await_count == 1
-    assert mock_update.await_count == 1
-    assert mock_mark_done.await_count == 1
+    assert raw_event_inserted.is_set()
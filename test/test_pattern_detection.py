@@ -3,6 +3,7 @@ from uuid import uuid4
 
 import pytest
 from pytest import param
+from pytest_mock import MockerFixture
 
 from app.models import ActionType, EnrichedEvent, EventType, Pattern, SessionContext, Severity
 from app.services.pattern_detection import EventFilter, PatternEngine, PatternRule, SessionFilter
@@ -358,6 +359,58 @@ def test_session_filter_matches(
             False,  # Should not match (event found in exactly 45 minutes since last one)
             id="negative_filter_time_window_block",
         ),
+        param(
+            [
+                EnrichedEvent(
+                    enriched_event_id=uuid4(),
+                    raw_event_id=uuid4(),
+                    user_id="user-123",
+                    session_id="session-456",
+                    timestamp=datetime(2020, 1, 1, 0, 50),
+                    created_at=datetime(2020, 1, 1, 0, 50),
+                    event_name="checkout_started",
+                    event_type=EventType.custom,
+                    semantic_label="Started checkout",
+                    sequence_number=2,
+                ),
+                EnrichedEvent(
+                    enriched_event_id=uuid4(),
+                    raw_event_id=uuid4(),
+                    user_id="user-123",
+                    session_id="session-456",
+                    timestamp=datetime(2020, 1, 1),
+                    created_at=datetime(2020, 1, 1),
+                    event_name="checkout_started",
+                    event_type=EventType.custom,
+                    semantic_label="Started checkout",
+                    sequence_number=1,
+                ),
+                EnrichedEvent(
+                    enriched_event_id=uuid4(),
+                    raw_event_id=uuid4(),
+                    user_id="user-123",
+                    session_id="session-456",
+                    timestamp=datetime(2020, 1, 1, 1, 0),
+                    created_at=datetime(2020, 1, 1, 1, 0),
+                    event_name="order_completed",
+                    event_type=EventType.custom,
+                    semantic_label="Order completed",
+                    sequence_number=3,
+                ),
+            ],
+            SAMPLE_SESSION_CONTEXT,
+            PatternRule(
+                code="checkout_abandoned",
+                description="Checkout abandoned",
+                severity=Severity.high,
+                filter=EventFilter(semantic_contains="checkout"),
+                min_count=1,
+                negative_filter=EventFilter(semantic_contains="completed"),
+                negative_time_window=timedelta(minutes=30),
+            ),
+            False,  # Window starts at the last positive by sequence, not by list position
+            id="negative_filter_time_window_unordered_events",
+        ),
     ],
 )
 def test_pattern_rule_match(
@@ -415,6 +468,69 @@ def test_pattern_engine_detects_matching_patterns(
     assert sorted(p.code for p in patterns) == sorted(expected_detected_codes)
 
 
+def test_pattern_engine_applies_shared_filter_once(mocker: MockerFixture) -> None:
+    """Rules with equal filters reuse one filter pass per detect call"""
+    rules = [
+        PatternRule(
+            code=code,
+            description=code,
+            severity=Severity.low,
+            filter=EventFilter(event_type=EventType.pageview),
+            negative_filter=EventFilter(event_type=EventType.navigation),
+        )
+        for code in ("first_pattern", "second_pattern")
+    ]
+    apply_spy = mocker.spy(EventFilter, "apply")
+
+    patterns = PatternEngine(rules).detect(SAMPLE_EVENTS, SAMPLE_SESSION_CONTEXT)
+
+    assert [p.code for p in patterns] == ["first_pattern", "second_pattern"]
+    assert apply_spy.call_count == 2
+
+
+def test_pattern_engine_matches_shared_session_filter_once(mocker: MockerFixture) -> None:
+    """Rules with equal session filters reuse one session check per detect call"""
+    rules = [
+        PatternRule(
+            code=code,
+            description=code,
+            severity=Severity.low,
+            session_filter=SessionFilter(min_events=5),
+        )
+        for code in ("first_pattern", "second_pattern")
+    ]
+    matches_spy = mocker.spy(SessionFilter, "matches")
+
+    patterns = PatternEngine(rules).detect(SAMPLE_EVENTS, SAMPLE_SESSION_CONTEXT)
+
+    assert [p.code for p in patterns] == ["first_pattern", "second_pattern"]
+    assert matches_spy.call_count == 1
+
+
+def test_pattern_engine_without_events_only_evaluates_eventless_rules(mocker: MockerFixture) -> None:
+    """Rules needing events are skipped for an empty session, session-only rules still match"""
+    rules = [
+        PatternRule(
+            code="pageview_pattern",
+            description="Has pageview",
+            severity=Severity.low,
+            filter=EventFilter(event_type=EventType.pageview),
+        ),
+        PatternRule(
+            code="short_session",
+            description="Very short session",
+            severity=Severity.low,
+            session_filter=SessionFilter(max_duration_seconds=10),
+        ),
+    ]
+    matches_spy = mocker.spy(PatternRule, "matches")
+
+    patterns = PatternEngine(rules).detect([], SAMPLE_SESSION_CONTEXT)
+
+    assert [p.code for p in patterns] == ["short_session"]
+    assert matches_spy.call_count == 1
+
+
 def test_pattern_to_pattern_conversion() -> None:
     """Test PatternRule.to_pattern() creates proper Pattern object"""
     rule = PatternRule(
@@ -0,0 +1,136 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest import param
+from sqlalchemy import JSON
+
+from app.db_models import enriched_event
+from app.models import EnrichedEventCreate
+from app.services.event_parsing import EventType
+from app.services.persist_services import ENRICHED_EVENTS_COPY_THRESHOLD, _to_copy_record, create_enriched_events
+
+
+@pytest.fixture
+def driver_connection(mock_connection: AsyncMock) -> MagicMock:
+    """asyncpg connection behind the mocked SQLAlchemy connection, inside a started transaction"""
+    driver = MagicMock()
+    driver.copy_records_to_table = AsyncMock()
+    driver.is_in_transaction.return_value = True
+    mock_connection.get_raw_connection.return_value = MagicMock(driver_connection=driver)
+    return driver
+
+
+@pytest.mark.parametrize(
+    "batch_size,uses_copy",
+    [
+        param(1, False, id="single_event"),
+        param(ENRICHED_EVENTS_COPY_THRESHOLD, False, id="at_threshold"),
+        param(ENRICHED_EVENTS_COPY_THRESHOLD + 1, True, id="above_threshold"),
+    ],
+)
+async def test_create_enriched_events_picks_insert_method(
+    mock_connection: AsyncMock,
+    driver_connection: MagicMock,
+    sample_enriched_event: EnrichedEventCreate,
+    batch_size: int,
+    uses_copy: bool,
+) -> None:
+    """Test that batches up to the threshold use executemany and larger ones are streamed with COPY"""
+    await create_enriched_events(mock_connection, [sample_enriched_event] * batch_size)
+
+    if uses_copy:
+        mock_connection.execute.assert_not_awaited()
+        driver_connection.copy_records_to_table.assert_awaited_once()
+        kwargs = driver_connection.copy_records_to_table.await_args.kwargs
+        assert len(kwargs["records"]) == batch_size
+        assert kwargs["columns"] == list(EnrichedEventCreate.model_fields)
+    else:
+        mock_connection.execute.assert_awaited_once()
+        assert len(mock_connection.execute.await_args.args[1]) == batch_size
+        driver_connection.copy_records_to_table.assert_not_awaited()
+
+
+async def test_create_enriched_events_empty(mock_connection: AsyncMock, driver_connection: MagicMock) -> None:
+    await create_enriched_events(mock_connection, [])
+
+    mock_connection.execute.assert_not_awaited()
+    driver_connection.copy_records_to_table.assert_not_awaited()
+
+
+@pytest.mark.parametrize("in_transaction", [param(True, id="in_transaction"), param(False, id="no_transaction")])
+async def test_create_enriched_events_copy_transaction(
+    mock_connection: AsyncMock,
+    driver_connection: MagicMock,
+    sample_enriched_event: EnrichedEventCreate,
+    in_transaction: bool,
+) -> None:
+    """Test that COPY starts its own transaction only when the caller's one hasn't sent BEGIN yet"""
+    driver_connection.is_in_transaction.return_value = in_transaction
+
+    await create_enriched_events(mock_connection, [sample_enriched_event] * (ENRICHED_EVENTS_COPY_THRESHOLD + 1))
+
+    driver_connection.copy_records_to_table.assert_awaited_once()
+    assert driver_connection.transaction.called is not in_transaction
+
+
+def test_to_copy_record_follows_model_fields_order(sample_enriched_event: EnrichedEventCreate) -> None:
+    record = _to_copy_record(sample_enriched_event)
+
+    assert len(record) == len(EnrichedEventCreate.model_fields)
+    values = dict(zip(EnrichedEventCreate.model_fields, record))
+    assert values["raw_event_id"] == sample_enriched_event.raw_event_id
+    assert values["semantic_label"] == sample_enriched_event.semantic_label
+    assert values["sequence_number"] == sample_enriched_event.sequence_number
+
+
+def test_to_copy_record_matches_enriched_event_table(sample_enriched_event: EnrichedEventCreate) -> None:
+    """Test that COPY columns exist in the table and every record value has the raw type of its column"""
+    event = sample_enriched_event.model_copy(
+        update={
+            "action_type": "click",
+            "page_path": "/home",
+            "page_title": "Home",
+            "element_type": "button",
+            "element_text": "Sign up",
+            "context": {"nav": "home"},
+            "sequence_number": 1,
+        }
+    )
+
+    record = _to_copy_record(event)
+
+    for name, value in zip(EnrichedEventCreate.model_fields, record, strict=True):
+        column_type = enriched_event.c[name].type
+        expected_type = str if isinstance(column_type, JSON) else column_type.python_type
+        assert isinstance(value, expected_type), name
+    missing_columns = set(enriched_event.c.keys()) - set(EnrichedEventCreate.model_fields)
+    assert all(enriched_event.c[name].server_default is not None for name in missing_columns)
+
+
+def test_to_copy_record_converts_enums_to_values(sample_enriched_event: EnrichedEventCreate) -> None:
+    record = _to_copy_record(sample_enriched_event)
+
+    event_type = dict(zip(EnrichedEventCreate.model_fields, record))["event_type"]
+    assert event_type == EventType.pageview.value
+    assert type(event_type) is str
+
+
+@pytest.mark.parametrize(
+    "context,expected",
+    [
+        param(
+            {"nav": "home", "hierarchy": ["button", "div"]},
+            json.dumps({"nav": "home", "hierarchy": ["button", "div"]}),
+            id="dict",
+        ),
+        param({}, "{}", id="empty"),
+        param(None, None, id="missing"),
+    ],
+)
+def test_to_copy_record_encodes_context(
+    sample_enriched_event: EnrichedEventCreate, context: dict | None, expected: str | None
+) -> None:
+    record = _to_copy_record(sample_enriched_event.model_copy(update={"context": context}))
+
+    assert dict(zip(EnrichedEventCreate.model_fields, record))["context"] == expected
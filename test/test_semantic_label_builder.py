@@ -312,3 +312,45 @@ def test_semantic_label_builder_with_no_name_for_custom_event() -> None:
         properties={},
     )
     assert result == "Custom event"
+
+
+@mark.parametrize(
+    "event_type,action_type,expected",
+    [
+        param("pageview", "view", "Viewed home page", id="plain_strings"),
+        param(EventType.custom, None, "Custom event", id="missing_action_type"),
+        param("unrecognised", "unrecognised", "Event on home page", id="unknown_pair"),
+    ],
+)
+def test_semantic_label_builder_dispatch_outside_enum_pairs(event_type: str, action_type: str, expected: str) -> None:
+    """Test types outside the precomputed enum pairs dispatch the same as the match rules"""
+    builder = SemanticLabelBuilder()
+    result = builder.build(
+        event_type=event_type,
+        action_type=action_type,
+        page_info=PageInfo(page_path="/", page_title="home page"),
+        element_info=ParsedElements(),
+    )
+    assert result == expected
+
+
+@mark.parametrize(
+    "properties,expected",
+    [
+        param({"product": {"name": "Drone"}}, "Selected Drone", id="nested_property"),
+        param({"product": {}}, "Product clicked", id="nested_key_missing"),
+        param({"other": "value"}, "Product clicked", id="top_level_property_missing"),
+    ],
+)
+def test_semantic_label_builder_custom_template_with_nested_fields(properties: dict, expected: str) -> None:
+    """Test templates reading nested properties fall back to humanize when any part is missing"""
+    builder = SemanticLabelBuilder(custom_templates={"product_clicked": "Selected {product[name]}"})
+    result = builder.build(
+        event_type=EventType.custom,
+        action_type=ActionType.click,
+        page_info=PageInfo(page_path="/", page_title="home page"),
+        element_info=ParsedElements(),
+        event_name="product_clicked",
+        properties=properties,
+    )
+    assert result == expected
@@ -23,6 +23,21 @@ def test_truncate_text(text: str, max_length: int, expected: str) -> None:
     assert truncate_text(text, max_length) == expected
 
 
+@mark.parametrize("max_length", range(6))
+@mark.parametrize("text_length", range(7))
+def test_truncate_text_short_lengths(text_length: int, max_length: int) -> None:
+    """Test truncation invariants around the ellipsis length"""
+    text = "x" * text_length
+    result = truncate_text(text, max_length)
+
+    if text_length <= max_length:
+        assert result == text
+    else:
+        assert len(result) == max(max_length, 3)
+        assert result.endswith("...")
+        assert text.startswith(result[:-3])
+
+
 @mark.parametrize(
     "text,expected",
     [
@@ -62,6 +77,10 @@ def test_humanize_snake_case_string(text: str, expected: str) -> None:
     assert humanize_snake_case_string(text) == expected
 
 
+def test_humanize_snake_case_string_is_cached() -> None:
+    assert humanize_snake_case_string("plan_upgrade_started") is humanize_snake_case_string("plan_upgrade_started")
+
+
 @mark.parametrize(
     "text,expected",
     [